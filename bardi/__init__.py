@@ -1,2 +1,2 @@
-from bardi.pipeline import Step, Pipeline, DataWriteConfig
+from bardi.pipeline import Step, StepResult, Pipeline, DataWriteConfig
 from bardi.data import Dataset
@@ -9,6 +9,7 @@ from bardi.nlp_engineering.tokenizer_trainer import CPUTokenizerTrainer
 from bardi.nlp_engineering.utils import validations
 from bardi.nlp_engineering.utils.helper_utils import existing_split_mapping
 from bardi.nlp_engineering.utils.tokenizers_lib import (TrainableTokenizer,
+                                                        batch_tokenize,
                                                         load_hf_tokenizer,
                                                         load_tokenizer,
                                                         set_tokenizer_params)
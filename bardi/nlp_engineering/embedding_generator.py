@@ -17,7 +17,7 @@ from bardi.nlp_engineering.utils.validations import (
     validate_pyarrow_table,
     validate_list_str_cols,
 )
-from bardi.pipeline import DataWriteConfig, Step
+from bardi.pipeline import DataWriteConfig, Step, StepResult
 
 
 class EmbeddingGeneratorArtifactsWriteConfig(TypedDict):
@@ -111,7 +111,11 @@ class EmbeddingGenerator(Step):
         self.vocab_exclude_list = vocab_exclude_list
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }
         self._artifacts_write_config: EmbeddingGeneratorArtifactsWriteConfig = {
             "vocab_format": "json",
@@ -295,7 +299,7 @@ class CPUEmbeddingGenerator(EmbeddingGenerator):
             "id_to_token": self.id_to_token,
         }
 
-        return (data, produced_artifacts)
+        return StepResult(data, produced_artifacts)
 
     def write_artifacts(self, write_path: str, artifacts: dict) -> None:
         """Write the artifacts produced by the embedding generator.
@@ -10,7 +10,7 @@ import pyarrow as pa
 from bardi.data import data_handlers
 from bardi.nlp_engineering.utils.polars_utils import retain_inputs
 from bardi.nlp_engineering.utils.validations import validate_pyarrow_table
-from bardi.pipeline import DataWriteConfig, Step
+from bardi.pipeline import DataWriteConfig, Step, StepResult
 
 
 class LabelProcessorArtifactsWriteConfig(TypedDict):
@@ -75,7 +75,11 @@ class LabelProcessor(Step):
 
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }
         self._artifacts_write_config: LabelProcessorArtifactsWriteConfig = {
             "id_to_label_format": "json",
@@ -214,7 +218,7 @@ class CPULabelProcessor(LabelProcessor):
         # Set up the artifacts dict to return
         produced_artifacts = {"id_to_label": self.id_to_label}
 
-        return (data, produced_artifacts)
+        return StepResult(data, produced_artifacts)
 
     def write_artifacts(self, write_path: str, artifacts: dict) -> None:
         """Write the outputs produced by the label_processor
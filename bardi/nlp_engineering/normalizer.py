@@ -1,6 +1,10 @@
 """Clean text with custom sets of regular expressions"""
 
+import re
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from multiprocessing import cpu_count
 from typing import List, Tuple, Union, Optional
 
 import polars as pl
@@ -12,7 +16,19 @@ from bardi.nlp_engineering.utils.validations import (
     validate_pyarrow_table,
     validate_str_cols,
 )
-from bardi.pipeline import DataWriteConfig, Step
+from bardi.pipeline import DataWriteConfig, Step, StepResult
+
+# Smallest number of rows worth normalizing on a separate thread
+_MIN_ROWS_PER_SLICE = 5_000
+# Largest row slice, bounds the intermediate strings of each substitution
+_MAX_ROWS_PER_SLICE = 64 * 1024
+
+
+def _is_literal_sub(regex_sub_pair: RegexSubPair) -> bool:
+    """Check if a substitution pair replaces a plain string with a plain string,
+    i.e. the pattern has no regex syntax and the replacement no group reference"""
+    pattern = regex_sub_pair["regex_str"]
+    return re.escape(pattern) == pattern and "$" not in regex_sub_pair["sub_str"]
 
 
 class Normalizer(Step):
@@ -38,6 +54,9 @@ class Normalizer(Step):
     retain_input_fields : Optional[bool]
         If True, will retain the original contents of the fields specified in
         `fields` under the new names of: `normalizer__<field>`
+    cores : Optional[int]
+        Number of threads used to normalize slices of rows concurrently,
+        defaults to the number of available CPU cores.
     """
 
     def __init__(
@@ -46,6 +65,7 @@ class Normalizer(Step):
         regex_set: List[RegexSubPair],
         lowercase: bool = True,
         retain_input_fields: bool = False,
+        cores: Optional[int] = None,
     ):
         """Constructor method"""
         # Normalizer Configuration
@@ -55,11 +75,18 @@ class Normalizer(Step):
         self.retain_input_fields = retain_input_fields
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }  # Default write config
         self.lowercase = lowercase
         # List of regex substitutions to be applied
         self.regex_set: List[RegexSubPair] = regex_set
+        self.cores = cpu_count()
+        if cores:
+            self.cores = cores
 
     @abstractmethod
     def run(self):
@@ -89,6 +116,9 @@ class CPUNormalizer(Normalizer):
     retain_input_fields : Optional[bool]
         If True, will retain the original contents of the fields specified in
         `fields` under the new names of: `normalizer__<field>`
+    cores : Optional[int]
+        Number of threads used to normalize slices of rows concurrently,
+        defaults to the number of available CPU cores.
     """
 
     def __init__(self, *args, **kwargs):
@@ -124,48 +154,65 @@ class CPUNormalizer(Normalizer):
         validate_pyarrow_table(data=data)
         validate_str_cols(fields=self.fields, data=data)
 
-        def implement_regex_substitutions(df: pl.DataFrame) -> pl.DataFrame:
-            """Reusable function to apply each regex substitution
-            normalization to each string field
-
-            Parameters
-            ----------
-
-            df : pl.DataFrame
-                a DataFrame containing the columns specified in the Normalizer's
-                `fields` attribute
-
-            Returns
-            -------
-            pl.DataFrame
-                a DataFrame with the specified fields having its text transformed using
-                the regular expression substitution pairs in the Normalizer object's 'regex_set'
-                attribute
-            """
-
-            for regex_sub_pair in self.regex_set:
-                df = df.with_columns(
-                    [
-                        pl.col(field).str.replace_all(
-                            pattern=regex_sub_pair["regex_str"],
-                            value=regex_sub_pair["sub_str"],
-                        )
-                        for field in self.fields
-                    ]
-                )
-            return df
-
         # Use the Polars library to apply the normalization methods
-        # to each field of the Table that is specified in self.fields
-        df = (
-            pl.from_arrow(data)
-            .pipe(retain_inputs, self.retain_input_fields, self.fields, self.__class__.__name__)
-            .with_columns(
-                [pl.col(field).str.to_lowercase() for field in self.fields if self.lowercase]
-            )
-            .pipe(implement_regex_substitutions)
+        # to each field of the Table that is specified in self.fields.
+        # Lowercasing and every regex substitution are chained into a single
+        # expression per field so the fields are processed in one pass
+        # without realizing an intermediate DataFrame per substitution.
+        # The Arrow chunks are wrapped as they are, the row slices below
+        # don't need a contiguous copy of the table
+        df = pl.from_arrow(data, rechunk=False).pipe(
+            retain_inputs, self.retain_input_fields, self.fields, self.__class__.__name__
+        )
+        exprs = [self._normalize_expr(field) for field in self.fields]
+
+        # A substitution runs single threaded over a column, so larger inputs
+        # are split into row slices normalized concurrently. Polars releases
+        # the GIL while evaluating the expressions. Slices are capped in size
+        # so the strings produced between substitutions stay small
+        n_slices = max(
+            min(self.cores, ceil(df.height / _MIN_ROWS_PER_SLICE)),
+            ceil(df.height / _MAX_ROWS_PER_SLICE),
         )
+        if n_slices > 1:
+            slice_size = ceil(df.height / n_slices)
+            with ThreadPoolExecutor(max_workers=min(self.cores, n_slices)) as executor:
+                slices = executor.map(
+                    lambda offset: df.slice(offset, slice_size).with_columns(exprs),
+                    range(0, df.height, slice_size),
+                )
+                df = pl.concat(list(slices), rechunk=False)
+        else:
+            df = df.with_columns(exprs)
 
         data = df.to_arrow()
 
-        return (data, None)
+        return StepResult(data, None)
+
+    def _normalize_expr(self, field: str) -> pl.Expr:
+        """Build the normalization expression of a single field
+
+        Parameters
+        ----------
+
+        field : str
+            The name of the text column to normalize.
+
+        Returns
+        -------
+        pl.Expr
+            The field lowercased (if configured) with each regex substitution
+            pair applied in the order of the regex set.
+        """
+        expr = pl.col(field)
+        if self.lowercase:
+            expr = expr.str.to_lowercase()
+        for regex_sub_pair in self.regex_set:
+            # Plain string pairs (e.g. % --> percent) skip the regex engine
+            # and use Polars' literal substring search instead
+            expr = expr.str.replace_all(
+                pattern=regex_sub_pair["regex_str"],
+                value=regex_sub_pair["sub_str"],
+                literal=_is_literal_sub(regex_sub_pair),
+            )
+        return expr
@@ -1,17 +1,58 @@
 """Split text columns into lists of tokens using simple patterns"""
 
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from multiprocessing import cpu_count
 from typing import List, Tuple, Union, Optional
 
-import polars as pl
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 
-from bardi.nlp_engineering.utils.polars_utils import retain_inputs
 from bardi.nlp_engineering.utils.validations import (
     validate_pyarrow_table,
     validate_str_cols,
 )
-from bardi.pipeline import Step
+from bardi.pipeline import Step, StepResult
+
+# Smallest number of rows worth pre-tokenizing on a separate thread
+_MIN_ROWS_PER_SLICE = 5_000
+
+
+def _split_tokens(column: pa.ChunkedArray, split_pattern: str) -> pa.LargeListArray:
+    """Split a string column on a literal pattern, dropping empty tokens
+
+    Parameters
+    ----------
+
+    column : pa.ChunkedArray
+        A string or large_string column of text.
+    split_pattern : str
+        The literal pattern to split the text on.
+
+    Returns
+    -------
+    pa.LargeListArray
+        A large_list<large_string> array of the non-empty tokens of each row.
+        Null rows stay null.
+    """
+    column = column.combine_chunks()
+    if column.type != pa.large_string():
+        column = column.cast(pa.large_string())
+
+    split = pc.split_pattern(column, pattern=split_pattern)
+    tokens = split.values
+    keep = pc.not_equal(tokens, "")
+
+    # Count the kept tokens up to each original offset to get the new offsets
+    kept_counts = np.zeros(len(tokens) + 1, dtype=np.int64)
+    np.cumsum(keep.to_numpy(zero_copy_only=False), out=kept_counts[1:])
+    offsets = kept_counts[split.offsets.to_numpy()]
+
+    return pa.LargeListArray.from_arrays(
+        pa.array(offsets), tokens.filter(keep), mask=split.is_null()
+    )
 
 
 class PreTokenizer(Step):
@@ -37,6 +78,9 @@ class PreTokenizer(Step):
     retain_input_fields : Optional[bool]
         If True, will retain the original contents of the fields specified in
         `fields` under the new names of: `pretokenizer__<field>`
+    cores : Optional[int]
+        Number of threads used to pre-tokenize slices of rows concurrently,
+        defaults to the number of available CPU cores.
     """
 
     def __init__(
@@ -44,6 +88,7 @@ class PreTokenizer(Step):
         fields: Union[str, List[str]],
         split_pattern: str = " ",
         retain_input_fields: bool = False,
+        cores: Optional[int] = None,
     ):
         """Constructor method"""
         if isinstance(fields, str):
@@ -52,6 +97,9 @@ class PreTokenizer(Step):
             self.fields = fields
         self.retain_input_fields = retain_input_fields
         self.split_pattern = split_pattern
+        self.cores = cpu_count()
+        if cores:
+            self.cores = cores
 
     @abstractmethod
     def run(self):
@@ -80,6 +128,9 @@ class CPUPreTokenizer(PreTokenizer):
     retain_input_fields : Optional[bool]
         If True, will retain the original contents of the fields specified in
         `fields` under the new names of: `pretokenizer__<field>`
+    cores : Optional[int]
+        Number of threads used to pre-tokenize slices of rows concurrently,
+        defaults to the number of available CPU cores.
     """
 
     def __init__(self, *args, **kwargs):
@@ -114,23 +165,53 @@ class CPUPreTokenizer(PreTokenizer):
         validate_pyarrow_table(data=data)
         validate_str_cols(fields=self.fields, data=data)
 
-        # Split text fields into lists of tokens
-        df = (
-            pl.from_arrow(data)
-            .pipe(retain_inputs, self.retain_input_fields, self.fields, self.__class__.__name__)
-            .with_columns(
-                [
-                    (
-                        pl.col(field)
-                        .str.split(by=self.split_pattern)
-                        .list.eval(pl.element().filter(pl.element() != ""))
-                        .alias(field)
-                    )
-                    for field in self.fields
-                ]
+        # Retain original columns if needed, as large_string like the
+        # retained columns have always been
+        if self.retain_input_fields:
+            for field in self.fields:
+                data = data.append_column(
+                    f"{self.__class__.__name__}_input__{field}",
+                    data.column(field).cast(pa.large_string()),
+                )
+
+        # Split text fields into lists of tokens. The split works directly
+        # on the Arrow string buffers, avoiding a round trip through Polars
+        for field in self.fields:
+            data = data.set_column(
+                data.schema.get_field_index(field),
+                field,
+                self._split_field(data.column(field)),
             )
-        )
 
-        data = df.to_arrow()
+        return StepResult(data, None)
+
+    def _split_field(self, column: pa.ChunkedArray) -> pa.ChunkedArray:
+        """Split a text column into lists of tokens
+
+        Parameters
+        ----------
+
+        column : pa.ChunkedArray
+            A string or large_string column of text.
 
-        return (data, None)
+        Returns
+        -------
+        pa.ChunkedArray
+            A large_list<large_string> column of the tokens of each row.
+        """
+        # A split kernel runs single threaded over a column, so larger inputs
+        # are split into row slices pre-tokenized concurrently. Arrow releases
+        # the GIL while running its compute kernels
+        n_slices = min(self.cores, ceil(len(column) / _MIN_ROWS_PER_SLICE))
+        if n_slices > 1:
+            slice_size = ceil(len(column) / n_slices)
+            with ThreadPoolExecutor(max_workers=n_slices) as executor:
+                slices = executor.map(
+                    lambda offset: _split_tokens(
+                        column.slice(offset, slice_size), self.split_pattern
+                    ),
+                    range(0, len(column), slice_size),
+                )
+                return pa.chunked_array(list(slices))
+
+        return pa.chunked_array([_split_tokens(column, self.split_pattern)])
@@ -77,7 +77,7 @@ def get_urls_regex() -> RegexSubPair:
         Source: URLTOKEN 
     """
     regex_sub_pair = {
-        "regex_str": r"\b(http[s]*:\/\/)[^\s]+|\b(www\.)[^\s]+",
+        "regex_str": r"\b(?:https*:\/\/|www\.)[^\s]+",
         "sub_str": " URLTOKEN ",
     }
     return regex_sub_pair
@@ -210,7 +210,7 @@ def get_leading_digit_punctuation_regex() -> RegexSubPair:
         13 unremarkable   1 e   22 years  
     """
     regex_sub_pair = {
-        "regex_str": r"(\b\d{1,})([\-\.:])([a-z]+)",
+        "regex_str": r"(\b\d+)([\-\.:])([a-z]+)",
         "sub_str": r" \1 \3 ",
     }
     return regex_sub_pair
@@ -337,7 +337,7 @@ def get_dimension_spacing_regex() -> RegexSubPair:
     
         measuring 1.3 x 0.7 x 0.1 cm
     """
-    regex_sub_pair = {"regex_str": r"(\d+[.\d]*)([x])", "sub_str": r"\1 \2 "}
+    regex_sub_pair = {"regex_str": r"(\d+[.\d]*)(x)", "sub_str": r"\1 \2 "}
     return regex_sub_pair
 
 
@@ -363,7 +363,7 @@ def get_measure_spacing_regex() -> RegexSubPair:
     
         10 mm  histologic type 2 x 3 cm . this is 3.0 cm  
     """
-    regex_sub_pair = {"regex_str": r"(\d+)[-]*([cpamt][mlhc])", "sub_str": r"\1 \2 "}
+    regex_sub_pair = {"regex_str": r"(\d+)-*([cpamt][mlhc])", "sub_str": r"\1 \2 "}
     return regex_sub_pair
 
 
@@ -470,7 +470,7 @@ def get_fix_pluralization_regex() -> RegexSubPair:
     
          specimens codes 
     """
-    regex_sub_pair = {"regex_str": r"(\b[a-z]+)(\s+)([s]\s)", "sub_str": r"\1\3"}
+    regex_sub_pair = {"regex_str": r"(\b[a-z]+)(\s+)(s\s)", "sub_str": r"\1\3"}
     return regex_sub_pair
 
 
@@ -495,7 +495,7 @@ def get_digits_words_spacing_regex() -> RegexSubPair:
     
         9837648 admission 
     """
-    regex_sub_pair = {"regex_str": r"(\s\d{1,})([a-z]{2,}\s)", "sub_str": r"\1 \2"}
+    regex_sub_pair = {"regex_str": r"(\s\d+)([a-z]{2,}\s)", "sub_str": r"\1 \2"}
     return regex_sub_pair
 
 
@@ -548,10 +548,10 @@ def get_dates_regex() -> RegexSubPair:
         co:  DATETOKEN completed:  DATETOKEN .
     """
     regex_list = [
-        r"\d{1,2}\s*[\/,-\.]\s*\d{1,2}\s*[\/,-\.]\s*\d{2,4}\s*[at\s\-]*[\d{1,2}\s*[:\s*\d{1,2}]+]*(?:\s*[pa][m])*",
+        r"\d{1,2}\s*[\/,-\.]\s*\d{1,2}\s*[\/,-\.]\s*\d{2,4}\s*[at\s\-]*[\d\s:]*(?:\s*[pa]m)*",
         r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s*\d{1,2}\s*\d{2,4}",
         r"\b\d{1,2}\s*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s*\d{2,4}",
-        r"\d{1,2}-(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)-\d{2}\s*\d{1,2}[:\d{1,2}]+(?:\s*[pa][m])",
+        r"\d{1,2}-(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)-\d{2}\s*\d{1,2}[:\d]+(?:\s*[pa]m)",
     ]
     consolidated_regex = f"{'|'.join(regex_list)}"
     regex_sub_pair = {"regex_str": consolidated_regex, "sub_str": " DATETOKEN "}
@@ -580,9 +580,9 @@ def get_time_regex() -> RegexSubPair:
         at  TIMETOKEN  or  TIMETOKEN  
     """
     regex_list = [
-        r"(\d{1,2}\s*([:.]\s*\d{2}){1,2}\s*[ap]\.*[m]\.*)",
-        r"\d{2}\s*[ap]\.*[m]\.*",
-        r"[0-2][0-9]:[0-5][1-9]",
+        r"(\d{1,2}\s*([:.]\s*\d{2}){1,2}\s*[ap]\.*m\.*)",
+        r"\d{2}\s*[ap]\.*m\.*",
+        r"[0-2][0-9]:[0-5][0-9]",
     ]
     consolidated_regex = f"{'|'.join(regex_list)}"
     regex_sub_pair = {"regex_str": consolidated_regex, "sub_str": " TIMETOKEN "}
@@ -638,12 +638,12 @@ def get_dimensions_regex() -> RegexSubPair:
     
           DIMENSIONTOKEN  cm and  DIMENSIONTOKEN  cm
     """
-    regex_list = [
-        r"\d+\.*\d*\s*x\s*\d+\.*\d*\s*x\s*\d+\.*\d*",
-        r"\d+\.*\d*\s*x\s*\d+\.*\d*",
-    ]
-    consolidated_regex = f"{'|'.join(regex_list)}"
-    regex_sub_pair = {"regex_str": consolidated_regex, "sub_str": " DIMENSIONTOKEN "}
+    # the third dimension is optional and greedy, so 3D measurements
+    # are matched whole before falling back to 2D
+    regex_sub_pair = {
+        "regex_str": r"\d+\.*\d*\s*x\s*\d+\.*\d*(?:\s*x\s*\d+\.*\d*)?",
+        "sub_str": " DIMENSIONTOKEN ",
+    }
     return regex_sub_pair
 
 
@@ -668,7 +668,7 @@ def get_specimen_regex() -> RegexSubPair:
          for  SPECIMENTOKEN   SPECIMENTOKEN  
     """
     regex_sub_pair = {
-        "regex_str": r"[a-z]{1,3}[-]*\d{2}[-]\d{3,}[-]*",
+        "regex_str": r"[a-z]{1,3}-*\d{2}-\d{3,}-*",
         "sub_str": " SPECIMENTOKEN ",
     }
     return regex_sub_pair
@@ -745,7 +745,7 @@ def get_large_float_seq_regex() -> RegexSubPair:
     
          456 LARGEFLOATTOKEN  
     """
-    regex_sub_pair = {"regex_str": r"\s\d{2,}\.\d{1,}", "sub_str": " LARGEFLOATTOKEN "}
+    regex_sub_pair = {"regex_str": r"\s\d{2,}\.\d+", "sub_str": " LARGEFLOATTOKEN "}
     return regex_sub_pair
 
 
@@ -769,7 +769,7 @@ def get_trunc_decimals_regex() -> RegexSubPair:
     
         1.7  9.8 - 8.9 
     """
-    regex_sub_pair = {"regex_str": r"\s(\d+)(\.)(\d)(\d+)*\s", "sub_str": r" \1\2\3 "}
+    regex_sub_pair = {"regex_str": r"\s(\d+)(\.)(\d)\d*\s", "sub_str": r" \1\2\3 "}
     return regex_sub_pair
 
 
@@ -794,10 +794,10 @@ def get_cassette_name_regex() -> RegexSubPair:
     
         block:  CASSETTETOKEN 
     """
+    # the markings enclosed in whitespace share the leading and trailing \s
     regex_list = [
-        r"\s\d{1,2}[\-]*[a-z]{1,2}\s",
-        r"\b[a-z][\-]*\d{1}\s",
-        r"\s[a-z]\d{1,2}-\d{1,2}\s",
+        r"\s(?:\d{1,2}-*[a-z]{1,2}|[a-z]\d{1,2}-\d{1,2})\s",
+        r"\b[a-z]-*\d\s",
     ]
     consolidated_regex = f"{'|'.join(regex_list)}"
     regex_sub_pair = {"regex_str": consolidated_regex, "sub_str": " CASSETTETOKEN "}
@@ -1,5 +1,7 @@
 """Segment the dataset into splits, such as `test, train, and val`"""
 
+import hashlib
+import json
 from abc import abstractmethod
 from typing import Dict, List, NamedTuple, Tuple, Union
 
@@ -8,7 +10,7 @@ import polars as pl
 import pyarrow as pa
 
 from bardi.nlp_engineering.utils.validations import validate_pyarrow_table
-from bardi.pipeline import DataWriteConfig, Step
+from bardi.pipeline import DataWriteConfig, Step, StepResult
 
 MapSplit = NamedTuple(
     "MapSplit",
@@ -139,6 +141,20 @@ class Splitter(Step):
             self.unique_record_cols = split_method.unique_record_cols
             self.split_mapping = split_method.split_mapping
             self.default_split_value = split_method.default_split_value
+            # The mapping keys are the string form of the u64 hashes, parse
+            # them once so the data can be matched on the raw hash
+            self._split_mapping_df = pl.DataFrame(
+                {
+                    "composite_record_id": pl.Series(
+                        list(self.split_mapping.keys()), dtype=pl.Utf8
+                    ).cast(pl.UInt64, strict=False),
+                    "split": pl.Series(list(self.split_mapping.values()), dtype=pl.Utf8),
+                }
+            ).drop_nulls("composite_record_id")
+            # A mapping can hold millions of records, so the parameters
+            # record its size and a digest of its contents instead. The
+            # digest is only computed when the parameters are requested
+            self._split_mapping_summary = None
         elif isinstance(split_method, NewSplit):
             self.split_type = "new"
             self.split_proportions = split_method.split_proportions
@@ -147,9 +163,21 @@ class Splitter(Step):
             self.group_cols = split_method.group_cols
             self.label_cols = split_method.label_cols
             self.random_seed = split_method.random_seed
+            # The split names gathered by label and their proportions
+            # are the same on every run
+            self._split_names = pl.Series(
+                "split", list(self.split_proportions.keys()), dtype=pl.Utf8
+            )
+            self._split_proportions = np.array(
+                list(self.split_proportions.values()), dtype=np.float64
+            )
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }  # Default write config
 
     @abstractmethod
@@ -279,80 +307,124 @@ class CPUSplitter(Splitter):
         # Perform validations
         validate_pyarrow_table(data=data)
 
-        df = pl.from_arrow(data)
-
         # Mapping from an existing data split - Good for comparisons
         if self.split_type == "map":
             # Apply an existing mapping of id -> split
 
             # Combine and hash the columns that form a unique/distinct
-            # record and map a dictionary set up as:
+            # record and look up the mapping set up as:
             # {id: split} where id is also a combined and hashed
-            # combination of the columns forming a unique record
-            df = (
-                df.with_columns(
-                    [pl.concat_str([*self.unique_record_cols]).hash().alias("composite_record_id")]
+            # combination of the columns forming a unique record.
+            # Only the record columns go through Polars, the split column
+            # is appended to the Arrow table as is
+            split = (
+                pl.from_arrow(data.select(self.unique_record_cols), rechunk=False)
+                .select(
+                    pl.concat_str([*self.unique_record_cols])
+                    .hash()
+                    .replace_strict(
+                        old=self._split_mapping_df.get_column("composite_record_id"),
+                        new=self._split_mapping_df.get_column("split"),
+                        default=self.default_split_value,
+                        return_dtype=pl.Utf8,
+                    )
+                    .alias("split")
                 )
-                .with_columns(
-                    [
-                        pl.col("composite_record_id")
-                        .cast(pl.Utf8())
-                        .replace(self.split_mapping, default=self.default_split_value)
-                        .alias("split")
-                    ]
-                )
-                .drop("composite_record_id")
+                .to_arrow()
+                .column("split")
             )
+            if "split" in data.column_names:
+                data = data.drop_columns("split")
+            data = data.append_column("split", split)
 
         elif self.split_type == "new":
+            # Only the group columns go through Polars, the other columns
+            # stay in the Arrow table the split column is appended to
+            df = pl.from_arrow(data.select(self.group_cols), rechunk=False)
+
             # Create a new split of the data if an existing desired
             # split does not yet exist
 
-            # Get the set of distinct groups from the overall data
-            distinct_groups = df.select([*self.group_cols]).unique(maintain_order=True)
-            group_count = distinct_groups.height
-
-            # Set random seeds for reporducibility
-            np.random.seed(self.random_seed)
+            # Number each record's group, in the order the groups first
+            # appear in the data. The groups are ranked on their values
+            # and the ranks are then renumbered by first appearance
+            group_ranks = df.select(pl.struct(self.group_cols).rank("dense")).to_series() - 1
+            distinct_ranks = group_ranks.unique(maintain_order=True).to_numpy()
+            group_count = len(distinct_ranks)
+            group_positions = np.empty(group_count, dtype=np.int64)
+            group_positions[distinct_ranks] = np.arange(group_count, dtype=np.int64)
+            group_ids = group_positions[group_ranks.to_numpy()]
+
+            # Set random seeds for reporducibility. The permutation is
+            # drawn from a local generator seeded the same way as the
+            # global one used to be, so earlier splits are reproduced
+            # without resetting the caller's global random state
+            rng = np.random.RandomState(self.random_seed)
             pl.set_random_seed(self.random_seed)
 
             # Generate a permutation of indices of distinct groups.
-            permuted_indices = np.random.permutation(group_count)
-
-            # The splits assignment has to be done with a number
-            # so a mapping must be created from a number to the
-            # desired split name
-            split_name_maps = {str(i): key for i, key in enumerate(self.split_proportions.keys())}
-
-            # Create a numpy array to hold the split labels (digits)
-            split_labels = np.empty(group_count, dtype=int)
-            start, end = 0, 0
-            # Loop over the split proportion and assign digit
-            # labels to the corresponding indices. If 15% of
-            # data should be in a given split then we take a next
-            # slice of permutated indices of that size and assign to them
-            # a given digit label.
-            for i, split_proportion in enumerate(self.split_proportions.items()):
-                end = start + int(split_proportion[1] * group_count)
-                split_labels[permuted_indices[start:end]] = i
-                start = end
+            permuted_indices = rng.permutation(group_count)
+
+            # Assign digit labels to consecutive slices of the permuted
+            # indices. If 15% of data should be in a given split then
+            # the next slice of permutated indices of that size is
+            # assigned the split's digit label.
+            split_ends = np.minimum(
+                np.cumsum((self._split_proportions * group_count).astype(np.int64)),
+                group_count,
+            )
+            split_counts = np.diff(split_ends, prepend=0)
             # In case some of incides are left out due to divisibility.
-            split_labels[permuted_indices[end:]] = i
-            split_labels = pl.Series(split_labels).cast(pl.Utf8)
-
-            # Add split labels as a column to distince groups
-            # mapped to assigned value back to the name of
-            # the split
-            splits = distinct_groups.with_columns(
-                split_labels.replace(split_name_maps).alias("split")
+            split_counts[-1] += group_count - split_ends[-1]
+
+            split_labels = np.empty(group_count, dtype=np.int64)
+            split_labels[permuted_indices] = np.repeat(
+                np.arange(self.num_splits, dtype=np.int64), split_counts
+            )
+
+            # Gather the name of the split at the label of each record's
+            # group, which is the position of the split name. Every record
+            # of a group is mapped to the same split this way. Records
+            # missing a group value are left without a split
+            split = (
+                df.select(
+                    pl.when(pl.any_horizontal(pl.all().is_null()))
+                    .then(None)
+                    .otherwise(self._split_names.gather(split_labels[group_ids]))
+                    .alias("split")
+                )
+                .to_arrow()
+                .column("split")
             )
+            if "split" in data.column_names:
+                data = data.drop_columns("split")
+            data = data.append_column("split", split)
 
-            # Join the split set of distinct groups back to the rest
-            # of the data. If a group had more than one record in the
-            # dataset, this join will ensure those records are mapped
-            # to the same split as the others in the group
-            df = df.join(splits, on=[*self.group_cols], how="left")
+        return StepResult(data, None)
 
-        data = df.to_arrow()
+    def get_parameters(self) -> dict:
+        """Retrieve the splitter object configuration
+        The split mapping is summarized by its number of records and
+        the sha256 digest of its contents, computed on the first call.
+        The copies of the configuration prepared for the run method
+        are not returned
 
-        return (data, None)
+        Returns
+        -------
+
+        dict
+            a dictionary representation of the splitter's attributes
+        """
+        if self.split_type == "map" and self._split_mapping_summary is None:
+            self._split_mapping_summary = {
+                "n": len(self.split_mapping),
+                "sha256": hashlib.sha256(
+                    json.dumps(self.split_mapping, sort_keys=True).encode()
+                ).hexdigest(),
+            }
+        params = vars(self).copy()
+        for prepared in ["_split_mapping_df", "_split_names", "_split_proportions"]:
+            params.pop(prepared, None)
+        if "split_mapping" in params:
+            params["split_mapping"] = params.pop("_split_mapping_summary")
+        return params
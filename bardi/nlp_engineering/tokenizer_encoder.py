@@ -1,17 +1,20 @@
 """Apply a tokenizer to the provided text fields"""
 
+import gc
+import warnings
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import cpu_count
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
-import datasets
+import numpy as np
 import polars as pl
 import pyarrow as pa
 
 from bardi.nlp_engineering.utils import tokenizers_lib
 from bardi.nlp_engineering.utils.polars_utils import retain_inputs
 from bardi.nlp_engineering.utils.validations import validate_pyarrow_table, validate_str_cols
-from bardi.pipeline import DataWriteConfig, Step
+from bardi.pipeline import DataWriteConfig, Step, StepResult
 
 
 class TokenizerEncoder(Step):
@@ -32,8 +35,9 @@ class TokenizerEncoder(Step):
         the name of the column containing a list of tokens
         that will be mapped to integers using a vocab
     return_tensors: str
-        type of tensors to return, 'np' for Numpy arrays,
-        'pt' for PyTorch tensors or 'tf' for TensorFlow
+        Deprecated and ignored. The tokenizer outputs are always added
+        to the data as Arrow list columns, built from Numpy batches.
+        Passing a value other than 'np' raises a DeprecationWarning
     concat_fields : bool
         whether the text fields should be concatenate into a single
         text field, defaults to False
@@ -58,6 +62,10 @@ class TokenizerEncoder(Step):
     tokenizer_params : Optional[dict]
         provide fine-grained customization for any valid HuggingFace Tokenizer parameter
         through a dictionary
+    compact_ids : bool
+        If True and the tokenizer vocab fits in 16 bits, token ids are written
+        as list<uint16> and masks as list<uint8> instead of list<int32> and
+        list<int8>, defaults to False
     tokenizer_model : transformers.PreTrainedTokenizerBase
         Tokenizer object passed through artifacts from TokenizerTrainer or
         read from file specified in `model_name`
@@ -75,6 +83,7 @@ class TokenizerEncoder(Step):
         model_name: Optional[str] = None,
         cores: Optional[int] = None,
         tokenizer_params: Optional[dict] = None,
+        compact_ids: bool = False,
     ):
         """Constructor method"""
         self.fields = fields
@@ -95,11 +104,23 @@ class TokenizerEncoder(Step):
         self.tokenizer_params = {}
         if tokenizer_params:
             self.tokenizer_params = tokenizer_params
+        if return_tensors != "np":
+            warnings.warn(
+                "TokenizerEncoder's return_tensors is deprecated and ignored, "
+                "the tokenizer outputs are always added as Arrow list columns.",
+                DeprecationWarning,
+                stacklevel=3,
+            )
         self.return_tensors = return_tensors
+        self.compact_ids = compact_ids
         self.tokenizer_model = None
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }  # Default write config
 
     @abstractmethod
@@ -122,8 +143,9 @@ class CPUTokenizerEncoder(TokenizerEncoder):
         the name of the column containing a list of tokens
         that will be mapped to integers using a vocab
     return_tensors: str
-        type of tensors to return, 'np' for Numpy arrays,
-        'pt' for PyTorch tensors or 'tf' for TensorFlow
+        Deprecated and ignored. The tokenizer outputs are always added
+        to the data as Arrow list columns, built from Numpy batches.
+        Passing a value other than 'np' raises a DeprecationWarning
     concat_fields : bool
         whether the text fields should be concatenate into a single
         text field, defaults to False
@@ -147,6 +169,10 @@ class CPUTokenizerEncoder(TokenizerEncoder):
         number of CPU cores for multithreading the tokenizer
     tokenizer_params : Optional[TokenizerConfig]
         provide fine-grained settings for applying tokenizer
+    compact_ids : bool
+        If True and the tokenizer vocab fits in 16 bits, token ids are written
+        as list<uint16> and masks as list<uint8> instead of list<int32> and
+        list<int8>, defaults to False
     tokenizer_model : transformers.PreTrainedTokenizerBase
         Tokenizer object passed through artifacts from TokenizerTrainer or
         read from file specified in `model_name`
@@ -220,8 +246,10 @@ class CPUTokenizerEncoder(TokenizerEncoder):
             self.tokenizer_model, **self.tokenizer_params
         )
 
-        # Retain input columns in original form if desired
-        df = pl.from_arrow(data)
+        # Retain input columns in original form if desired.
+        # The Arrow chunks are wrapped without a rechunk copy, the columns
+        # are only concatenated or renamed here
+        df = pl.from_arrow(data, rechunk=False)
 
         # Concat the fields if desired
         if self.concat_fields and len(self.fields) > 1:
@@ -252,45 +280,101 @@ class CPUTokenizerEncoder(TokenizerEncoder):
         elif len(self.fields) == 1:
             df = df.rename({self.fields[0]: self.field_rename})
 
-        # Apply tokenizer - we could support more params
-        def tokenize(text):
-            # add check for len here or filter dataframe first
-            return self.tokenizer_model(
-                text,
-                padding=True,
-                truncation=True,
-                max_length=self.tokenizer_model.model_max_length,
-                return_tensors=self.return_tensors,
-            )
-
         data = df.to_arrow()
-        hf_dataset = datasets.Dataset(arrow_table=data)
-
-        # there is a single column to process
-        if self.concat_fields or len(self.fields) == 1:
-            hf_dataset = hf_dataset.map(
-                lambda row: tokenize(row[self.field_rename]),
-                batched=True,
-                num_proc=self.cores,
+
+        # The tokenizer output is assembled from millions of small Python lists,
+        # which repeatedly triggers the cyclic garbage collector mid-batch.
+        # Pause it while tokenizing and collect once afterwards instead.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # there is a single column to process
+            if self.concat_fields or len(self.fields) == 1:
+                (encodings,) = self._encode([data.column(self.field_rename)])
+                if not self.retain_concat_field:
+                    data = data.drop_columns(self.field_rename)
+                for name, column in encodings.items():
+                    data = data.append_column(name, column)
+
+            # there are multiple columns each tokenized separately
+            # with the same tokenizer, their batches share one thread pool
+            # so short and long fields are tokenized concurrently
+            else:
+                field_encodings = self._encode([data.column(field) for field in self.fields])
+                data = data.drop_columns(self.fields)
+                for field, encodings in zip(self.fields, field_encodings):
+                    for name, column in encodings.items():
+                        data = data.append_column(f"{field}_{name}", column)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+            gc.collect()
+
+        return StepResult(data, None)
+
+    def _encode(
+        self, columns: List[pa.ChunkedArray], batch_size: int = 1000
+    ) -> List[Dict[str, pa.ChunkedArray]]:
+        """Tokenize text columns into unpadded list columns
+
+        Each column is cut into batches that are encoded with
+        `tokenizers_lib.batch_tokenize`. The batches of all columns are
+        spread over a small pool of threads sharing the tokenizer.
+
+        Parameters
+        ----------
+
+        columns : List[PyArrow ChunkedArray]
+            The string columns to tokenize
+        batch_size : int
+            Number of rows passed to the tokenizer per call
+
+        Returns
+        -------
+
+        List[Dict[str, PyArrow ChunkedArray]]
+            For each input column, a list column for every key returned
+            by the tokenizer (e.g. input_ids, attention_mask)
+        """
+        batches = [
+            (index, texts.slice(start, batch_size))
+            for index, texts in enumerate(columns)
+            for start in range(0, len(texts), batch_size)
+        ]
+        if not batches:
+            return [{} for _ in columns]
+
+        id_dtype, small_dtype = np.int32, np.int8
+        if self.compact_ids and len(self.tokenizer_model) <= np.iinfo(np.uint16).max + 1:
+            id_dtype, small_dtype = np.uint16, np.uint8
+
+        def encode_batch(texts: pa.ChunkedArray) -> Dict[str, pa.ListArray]:
+            return tokenizers_lib.batch_tokenize(
+                self.tokenizer_model,
+                texts.to_pylist(),
+                max_length=self.tokenizer_model.model_max_length,
+                chunk_size=batch_size,
+                id_dtype=id_dtype,
+                small_dtype=small_dtype,
             )
-            if not self.retain_concat_field:
-                hf_dataset = hf_dataset.remove_columns(self.field_rename)
-
-        # there are multiple columns each tokenized separately
-        # with the same tokenizer
-        else:
-            for field in self.fields:
-                hf_dataset = (
-                    hf_dataset.map(
-                        lambda row: tokenize(row[field]), batched=True, num_proc=self.cores
-                    )
-                    .rename_column("input_ids", f"{field}_input_ids")
-                    .rename_column("attention_mask", f"{field}_attention_mask")
-                    .remove_columns(field)
-                )
-        data = hf_dataset.data.table
 
-        return (data, None)
+        # All threads share the same tokenizer, the Rust backend releases the
+        # GIL while encoding. The first batch runs on its own so the padding
+        # and truncation settings are applied before the tokenizer is shared.
+        results = [encode_batch(batches[0][1])]
+        with ThreadPoolExecutor(max_workers=min(self.cores, 4)) as executor:
+            results.extend(executor.map(encode_batch, [texts for _, texts in batches[1:]]))
+
+        encoded = [[] for _ in columns]
+        for (index, _), result in zip(batches, results):
+            encoded[index].append(result)
+
+        return [
+            {name: pa.chunked_array([batch[name] for batch in column]) for name in column[0]}
+            if column
+            else {}
+            for column in encoded
+        ]
 
     def get_parameters(self):
         """Retrive the post-processor object configuration
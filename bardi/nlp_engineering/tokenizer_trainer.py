@@ -11,7 +11,7 @@ from tokenizers import Tokenizer
 from bardi.nlp_engineering.utils import tokenizers_lib
 from bardi.nlp_engineering.utils.tokenizers_lib import TrainableTokenizer
 from bardi.nlp_engineering.utils.validations import validate_pyarrow_table, validate_str_cols
-from bardi.pipeline import DataWriteConfig, Step
+from bardi.pipeline import DataWriteConfig, Step, StepResult
 
 
 class TokenizerTrainerArtifactsWriteConfig(TypedDict):
@@ -98,7 +98,11 @@ class TokenizerTrainer(Step):
 
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }
         self._artifacts_write_config: TokenizerTrainerArtifactsWriteConfig = {
             "vocab_format": "json",
@@ -234,7 +238,7 @@ class CPUTokenizerTrainer(TokenizerTrainer):
         else:
             produced_artifacts["tokenizer_type"] = self.tokenizer_type
 
-        return (data, produced_artifacts)
+        return StepResult(data, produced_artifacts)
 
     def write_artifacts(self, write_path: str, artifacts: Union[dict, None]) -> None:
         """Write the oartifactsproduced by the embedding_generator
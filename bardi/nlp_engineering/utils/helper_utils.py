@@ -1,12 +1,23 @@
 import json
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 import polars as pl
 
 
+@lru_cache(maxsize=32)
+def _composite_expr(cols: Tuple[str, ...]) -> pl.Expr:
+    """Build the composite_record_id expression once per set of columns"""
+    return pl.concat_str(list(cols)).hash().cast(pl.Utf8).alias("composite_record_id")
+
+
 def existing_split_mapping(
-    data_path: str, format: str, mapping_write_path: str, unique_record_cols: List[str]
-):
+    data_path: str,
+    format: str,
+    mapping_write_path: str,
+    unique_record_cols: List[str],
+    return_mapping: bool = True,
+) -> Optional[dict]:
     """Extract the split from an existing data_fold0.csv to
     duplicate the same split for pre-processing comparison
 
@@ -26,11 +37,16 @@ def existing_split_mapping(
     unique_record_cols : List[str]
         the set of columns that create a distinct record
         if only one column, still provide in a list
+    return_mapping : bool
+        if False, the mapping is streamed straight to `mapping_write_path`
+        without building the dictionary in memory and None is returned,
+        defaults to True
 
     Returns
     -------
-    dict
-        dictionary assigning each unique row to a given split
+    Optional[dict]
+        dictionary assigning each unique row to a given split,
+        None if `return_mapping` is False
     """
     if format == "csv":
         df = pl.scan_csv(source=data_path)
@@ -41,22 +57,30 @@ def existing_split_mapping(
 
     data_fold0_df = (
         df.select(*unique_record_cols, "split")
-        .with_columns(
-            [
-                pl.concat_str([*unique_record_cols])
-                .hash()
-                .cast(pl.Utf8())
-                .alias("composite_record_id")
-            ]
-        )
+        .with_columns(_composite_expr(tuple(unique_record_cols)))
         .select("composite_record_id", "split")
     ).collect()
 
-    mappings = data_fold0_df.to_struct(name="mappings").to_list()
+    if not return_mapping:
+        # Same layout as json.dump(..., indent=4) written slice by slice
+        with open(mapping_write_path, "w") as f:
+            separator = "{\n"
+            for batch in data_fold0_df.iter_slices(200_000):
+                for record_id, split in zip(
+                    batch["composite_record_id"].to_list(), batch["split"].to_list()
+                ):
+                    f.write(f"{separator}    {json.dumps(record_id)}: {json.dumps(split)}")
+                    separator = ",\n"
+            f.write("{}" if separator == "{\n" else "\n}")
+        return None
 
-    mapping = {d["composite_record_id"]: d["split"] for d in mappings}
+    mapping = dict(
+        zip(
+            data_fold0_df["composite_record_id"].to_list(),
+            data_fold0_df["split"].to_list(),
+        )
+    )
 
     with open(mapping_write_path, "w") as f:
         json.dump(mapping, f, indent=4)
-    f.close()
     return mapping
@@ -1,9 +1,37 @@
 """Utilities for the tokenizers' support"""
+import copy
+import os
+from functools import lru_cache
 from os.path import isdir
-from typing import Union
-
-from tokenizers import Tokenizer, models, pre_tokenizers, trainers
-from transformers import AutoTokenizer, PreTrainedTokenizerFast, PreTrainedTokenizerBase
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+
+# tokenizers and transformers are imported where they are used, importing
+# transformers alone takes the better part of a second
+if TYPE_CHECKING:
+    from tokenizers import Tokenizer
+    from transformers import AutoTokenizer, PreTrainedTokenizerFast
+
+# Tokenizer outputs that only hold a handful of small values (0/1 masks,
+# segment ids) are stored with a narrower type than the token ids
+_SMALL_VALUE_OUTPUTS = frozenset({"attention_mask", "token_type_ids", "special_tokens_mask"})
+
+# Supported trainable tokenizers: the tokenizers model and trainer class names,
+# the default special tokens and the model's keyword arguments. Classes are
+# referenced by name so tokenizers is only imported once a tokenizer is built.
+_TOKENIZER_REGISTRY = {
+    "WordPiece": (
+        "WordPiece",
+        "WordPieceTrainer",
+        ("[UNK]", "[PAD]", "[CLS]", "[SEP]", "[MASK]"),
+        {"unk_token": "[UNK]"},
+    ),
+    "BPE": ("BPE", "BpeTrainer", ("<|endoftext|>",), {}),
+    "Unigram": ("Unigram", "UnigramTrainer", ("<|endoftext|>",), {}),
+    "WordLevel": ("WordLevel", "WordLevelTrainer", ("<|endoftext|>",), {}),
+}
 
 
 class TrainableTokenizer:
@@ -29,60 +57,37 @@ class TrainableTokenizer:
             simply maps words to IDs, required large vocabulary size
     """
 
+    subword_tokenizers = frozenset(_TOKENIZER_REGISTRY)
+
     def __init__(self, tokenizer_type, voc_size, special_tokens):
+        from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+
         self.tokenizer_type = tokenizer_type
         self.voc_size = voc_size
         self.special_tokens = special_tokens
         self.tokenizer = None
         self.trainer = None
-        self.subword_tokenizers = ["WordPiece", "BPE", "Unigram", "WordLevel"]
 
-        if self.tokenizer_type == "WordPiece":
-            # default special tokens for WordPiece tokenizer
+        if self.tokenizer_type in _TOKENIZER_REGISTRY:
+            model_name, trainer_name, default_special_tokens, model_kwargs = _TOKENIZER_REGISTRY[
+                self.tokenizer_type
+            ]
             if self.special_tokens is None:
-                self.special_tokens = ["[UNK]", "[PAD]", "[CLS]", "[SEP]", "[MASK]"]
-            self.tokenizer = Tokenizer(models.WordPiece(unk_token="[UNK]"))
-
-            self.trainer = trainers.WordPieceTrainer(
-                vocab_size=self.voc_size,
-                special_tokens=self.special_tokens,
-            )
-
-        elif self.tokenizer_type == "BPE":
-            self.special_tokens = ["<|endoftext|>"]
-
-            self.tokenizer = Tokenizer(models.BPE())
-            self.trainer = trainers.BpeTrainer(
-                vocab_size=self.voc_size,
-                special_tokens=self.special_tokens,
-            )
-
-        elif self.tokenizer_type == "Unigram":
-            self.special_tokens = ["<|endoftext|>"]
+                self.special_tokens = list(default_special_tokens)
 
-            self.tokenizer = Tokenizer(models.Unigram())
-            self.trainer = trainers.UnigramTrainer(
+            self.tokenizer = Tokenizer(getattr(models, model_name)(**model_kwargs))
+            self.trainer = getattr(trainers, trainer_name)(
                 vocab_size=self.voc_size,
                 special_tokens=self.special_tokens,
             )
 
-        elif self.tokenizer_type == "WordLevel":
-            self.special_tokens = ["<|endoftext|>"]
-
-            self.tokenizer = Tokenizer(models.WordLevel())
-            self.trainer = trainers.WordLevelTrainer(
-                vocab_size=self.voc_size,
-                special_tokens=self.special_tokens,
-            )
         # subword tokenizers require a pretokenizer
         # for now all of them will use custom Whitespace
         if self.tokenizer_type in self.subword_tokenizers:
             self.tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
 
-        return
-
 
-def load_hf_tokenizer(path: str) -> AutoTokenizer:
+def load_hf_tokenizer(path: str) -> "AutoTokenizer":
     """
     Loads HF tokenizer for 'train a new tokenizer from an old' one option.
 
@@ -96,18 +101,22 @@ def load_hf_tokenizer(path: str) -> AutoTokenizer:
             - tokenizer_config.json
             - special_tokens_map.json
 
+    Note
+    ----
+
+    Loaded tokenizers are cached by path and modification time,
+    each call returns an independent copy of the cached tokenizer.
+
     Returns
     -------
 
     tokenizer : AutoTokenizer
         HF AutoTokenizer object
     """
-    tokenizer = AutoTokenizer.from_pretrained(path)
-
-    return tokenizer
+    return _load_through_cache(path)
 
 
-def load_tokenizer(path: str) -> Union[Tokenizer, AutoTokenizer]:
+def load_tokenizer(path: str) -> Union["Tokenizer", "AutoTokenizer"]:
     """
     Loads any HF tokenizer including model agnostic
     custom tokenizer. This will be extended to support
@@ -120,6 +129,14 @@ def load_tokenizer(path: str) -> Union[Tokenizer, AutoTokenizer]:
         path to directory or to .json file
         with a tokenizer info
 
+    Note
+    ----
+
+    Tokenizers loaded from a directory are cached by path and
+    modification time, each call returns an independent copy of
+    the cached tokenizer. A tokenizer .json file is read on every
+    call, copying a Tokenizer costs as much as parsing the file.
+
     Returns
     -------
 
@@ -129,18 +146,52 @@ def load_tokenizer(path: str) -> Union[Tokenizer, AutoTokenizer]:
         files
     """
     if isdir(path):
-        return AutoTokenizer.from_pretrained(path)
+        return _load_through_cache(path)
+
+    from tokenizers import Tokenizer
 
     return Tokenizer.from_file(path)
 
 
+def _local_path_version(path: str) -> Optional[Tuple[str, int]]:
+    """Canonical path and latest modification time of a local tokenizer file
+    or directory, None if the path isn't on the local file system (e.g. a
+    HuggingFace Hub model id)"""
+    path = os.path.realpath(path)
+    if isdir(path):
+        with os.scandir(path) as entries:
+            return path, max((entry.stat().st_mtime_ns for entry in entries), default=0)
+    if os.path.isfile(path):
+        return path, os.stat(path).st_mtime_ns
+    return None
+
+
+@lru_cache(maxsize=16)
+def _load_cached(path: str, modified: int):
+    """Load an AutoTokenizer once per path and modification time"""
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(path)
+
+
+def _load_through_cache(path: str):
+    """Return a copy of the cached AutoTokenizer at path, tokenizers are
+    stateful (e.g. set_tokenizer_params changes them in place) so callers
+    don't share the cached object"""
+    version = _local_path_version(path)
+    if version is None:
+        return _load_cached.__wrapped__(path, 0)
+
+    return copy.deepcopy(_load_cached(*version))
+
+
 def set_tokenizer_params(
-    tokenizer: Union[AutoTokenizer, Tokenizer],
+    tokenizer: Union["AutoTokenizer", "Tokenizer"],
     model_max_length: int = 4096,
     unk_token: str = "[UNK]",
     pad_token: str = "[PAD]",
     *args, **kwargs
-) -> AutoTokenizer:
+) -> "AutoTokenizer":
     """Overwrites the defaults AutoTokenizer settings.
     If a user provides a TokenizerConfigs object then
     AutoTokenizer's settings are set to the values provided.
@@ -175,30 +226,104 @@ def set_tokenizer_params(
 
     tokenizer : AutoTokenizer
     """
+    from tokenizers import Tokenizer
+    from transformers import PreTrainedTokenizerBase, PreTrainedTokenizerFast
 
     # Setting params for a custom trained tokenizer
     if isinstance(tokenizer, Tokenizer):
         tokenizer = PreTrainedTokenizerFast(
             tokenizer_object=tokenizer,
-            max_length=model_max_length,
+            model_max_length=model_max_length,
             unk_token=unk_token,
             pad_token=pad_token,
             *args, **kwargs
         )
 
-    # Setting params for an HF PreTrainedTokenizer
-    if isinstance(tokenizer, PreTrainedTokenizerBase):
+    # Setting params for an HF PreTrainedTokenizer, this also replaces the
+    # 1000000000000000019884624838656 some pretrained tokenizers use for "not set"
+    elif isinstance(tokenizer, PreTrainedTokenizerBase):
         tokenizer.model_max_length = model_max_length
 
-        # some pretrained tokenizers have model_max_size set
-        # to  1000000000000000019884624838656 which is equivalent to not set
-        if tokenizer.model_max_length > 1000000000000000:
-            tokenizer.model_max_length = model_max_length
-
     # Add special tokens if they were not specified already
+    missing_special_tokens = {}
     if tokenizer.pad_token is None:
-        tokenizer.add_special_tokens({"pad_token": pad_token})
+        missing_special_tokens["pad_token"] = pad_token
     if tokenizer.unk_token is None:
-        tokenizer.add_special_tokens({"unk_token": unk_token})
+        missing_special_tokens["unk_token"] = unk_token
+    if missing_special_tokens:
+        tokenizer.add_special_tokens(missing_special_tokens)
 
     return tokenizer
+
+
+def batch_tokenize(
+    tokenizer: "PreTrainedTokenizerFast",
+    texts: List[str],
+    max_length: int,
+    chunk_size: int = 10000,
+    id_dtype: type = np.int32,
+    small_dtype: type = np.int8,
+) -> Dict[str, pa.ListArray]:
+    """Tokenize a list of texts into Arrow list arrays
+
+    The texts are passed to the tokenizer in as few calls as possible so the
+    encoding runs in the Rust backend (make sure a fast tokenizer is used).
+    Each call returns padded 2-D NumPy arrays. The attention mask gives the
+    real length of every row, which is used to build the list offsets
+    directly and to pull the valid tokens out of the padded arrays with a
+    single boolean index, so PyArrow never infers types from Python lists.
+    The returned lists don't contain padding.
+
+    Parameters
+    ----------
+
+    tokenizer : PreTrainedTokenizerFast
+        A HuggingFace tokenizer object
+    texts : List[str]
+        The texts to tokenize
+    max_length : int
+        Texts are truncated to this many tokens
+    chunk_size : int
+        Maximum number of texts per tokenizer call, bounds the
+        size of the padded arrays
+    id_dtype : type
+        NumPy type of the token ids, defaults to int32
+    small_dtype : type
+        NumPy type of the masks and token type ids, defaults to int8
+
+    Returns
+    -------
+
+    Dict[str, PyArrow ListArray]
+        A list array for every key returned by the tokenizer
+        (e.g. input_ids, attention_mask)
+    """
+    chunks = []
+    for start in range(0, len(texts), chunk_size):
+        encodings = tokenizer(
+            texts[start : start + chunk_size],
+            padding="longest",
+            truncation=True,
+            max_length=max_length,
+            return_tensors="np",
+        )
+        valid = encodings["attention_mask"].astype(bool)
+        lengths = valid.sum(axis=1).astype(np.int32)
+        offsets = pa.array(np.concatenate([[0], np.cumsum(lengths)]).astype(np.int32))
+        chunks.append(
+            {
+                name: pa.ListArray.from_arrays(
+                    offsets,
+                    pa.array(
+                        padded[valid].astype(
+                            small_dtype if name in _SMALL_VALUE_OUTPUTS else id_dtype
+                        )
+                    ),
+                )
+                for name, padded in encodings.items()
+            }
+        )
+
+    if len(chunks) == 1:
+        return chunks[0]
+    return {name: pa.concat_arrays([chunk[name] for chunk in chunks]) for name in chunks[0]}
@@ -1,6 +1,35 @@
 from typing import List, Union
 
-from pyarrow import Table, large_list, large_string, list_, string
+from pyarrow import DataType, Table, large_string, string, types
+
+# Built once rather than on every validation call
+_STR_TYPES = frozenset({string(), large_string()})
+
+
+def _is_list_str_type(data_type: DataType) -> bool:
+    """Whether a type is list[string] or large_list[(large_)string]
+
+    List types compare equal regardless of the name of their child field but
+    do not hash equally, so the value type is checked instead of looking the
+    list type itself up in a set.
+    """
+    return (
+        types.is_list(data_type) or types.is_large_list(data_type)
+    ) and data_type.value_type in _STR_TYPES
+
+
+def _field_type(field: str, data: Table) -> DataType:
+    """Look up the type of a single field in the table's schema
+
+    Raises:
+        TypeError if the field is not present in the table
+    """
+    try:
+        return data.schema.field(field).type
+    except KeyError:
+        raise TypeError(f'The field, "{field}", indicated is not present'
+                        ' in the data and cannot be utilized with'
+                        ' this method') from None
 
 
 def validate_pyarrow_table(data: Table) -> None:
@@ -31,30 +60,17 @@ def validate_str_cols(fields: Union[List[str], str], data: Table) -> None:
 
     Raises:
         TypeError if the columns supplied in the 'fields' keyword argument
-        are not of PyArrow types string or large_string.
+        are missing or are not of PyArrow types string or large_string.
     """
-    # Gather the string fields in the table
-    all_pyarrow_schema_fields = [data.schema.field(name)
-                                 for name in data.column_names]
-    str_fields = [field.name for field in all_pyarrow_schema_fields
-                  if field.type in [large_string(), string()]]
-
     if isinstance(fields, str):
-        # If a single field was passed in to "fields" of the object,
-        # check to ensure it is a string
-        if fields not in str_fields:
-            raise TypeError('The field indicated is not a string'
-                            ' field and cannot be utilized with'
-                            ' this method.')
         fields = [fields]
-    elif isinstance(fields, list):
-        # If a list of fields was passed in to "fields" of the object,
-        # ensure they are all strings
-        for field in fields:
-            if field not in str_fields:
-                raise TypeError(f'The field, "{field}", indicated is'
-                                ' not a string field and cannot be'
-                                ' utilized with this method')
+
+    # Only the requested fields are looked up in the schema
+    for field in fields:
+        if _field_type(field, data) not in _STR_TYPES:
+            raise TypeError(f'The field, "{field}", indicated is'
+                            ' not a string field and cannot be'
+                            ' utilized with this method')
 
 
 def validate_list_str_cols(fields: Union[List[str], str], data: Table) -> None:
@@ -67,30 +83,14 @@ def validate_list_str_cols(fields: Union[List[str], str], data: Table) -> None:
 
     Raises:
         TypeError if the columns supplied in the 'fields' keyword argument
-        are not of PyArrow types list[string] or list[large_string].
+        are missing or are not of PyArrow types list[string] or list[large_string].
     """
-    # Gather the list fields in the table
-    all_pyarrow_schema_fields = [data.schema.field(name)
-                                 for name in data.column_names]
-    list_str_fields = [field.name for field in all_pyarrow_schema_fields
-                       if field.type in [large_list(large_string()),
-                                         large_list(string()),
-                                         list_(string()),
-                                         list_(large_string())]]
-
     if isinstance(fields, str):
-        # If a single field was passed in to "fields" of the object,
-        # check to ensure it is a string
-        if fields not in list_str_fields:
-            raise TypeError('The field indicated is not a string'
-                            ' field and cannot be utilized with'
-                            ' this method.')
         fields = [fields]
-    elif isinstance(fields, list):
-        # If a list of fields was passed in to "fields" of the object,
-        # ensure they are all strings
-        for field in fields:
-            if field not in list_str_fields:
-                raise TypeError(f'The field, "{field}", indicated is'
-                                ' not a string field and cannot be'
-                                ' utilized with this method')
+
+    # Only the requested fields are looked up in the schema
+    for field in fields:
+        if not _is_list_str_type(_field_type(field, data)):
+            raise TypeError(f'The field, "{field}", indicated is'
+                            ' not a string field and cannot be'
+                            ' utilized with this method')
@@ -2,21 +2,117 @@
 into a list of integers"""
 
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil
-from sys import getsizeof
-from typing import List, Union
+from multiprocessing import cpu_count
+from typing import List, Optional, Union
 
 import numpy as np
-import polars as pl
 import pyarrow as pa
+import pyarrow.compute as pc
 
-from bardi.data.utils.pyarrow_utils import chunk_pyarrow_table
-from bardi.nlp_engineering.utils.polars_utils import retain_inputs
 from bardi.nlp_engineering.utils.validations import (
     validate_list_str_cols,
     validate_pyarrow_table,
 )
-from bardi.pipeline import DataWriteConfig, Step
+from bardi.pipeline import DataWriteConfig, Step, StepResult
+
+# Smallest number of rows worth encoding on a separate thread
+_MIN_ROWS_PER_SLICE = 5_000
+
+
+def _encode_list_column(
+    column: pa.ChunkedArray, vocab_tokens: pa.Array, vocab_ids: pa.Array, unk_id: int = None
+) -> pa.LargeListArray:
+    """Map a list<string> column to a large_list column of vocab ids
+
+    Parameters
+    ----------
+
+    column : PyArrow ChunkedArray
+        list of string tokens per row
+    vocab_tokens : PyArrow Array
+        the tokens of the vocab
+    vocab_ids : PyArrow Array
+        the ids of the vocab, aligned with vocab_tokens. The ids
+        of the returned lists share its integer type
+    unk_id : int
+        id given to tokens missing from the vocab. Missing tokens
+        are left null if not provided
+
+    Returns
+    -------
+
+    PyArrow LargeListArray
+        the ids of the tokens with the list structure (and nulls)
+        of the original column
+    """
+    column = column.combine_chunks()
+    offsets = column.offsets.cast(pa.int64())
+    tokens = column.values
+    if len(offsets) and (offsets[0].as_py() or offsets[-1].as_py() != len(tokens)):
+        # values is the whole child array of a row slice, only look up
+        # the tokens in range of the sliced rows
+        start = offsets[0].as_py()
+        tokens = tokens.slice(start, offsets[-1].as_py() - start)
+        offsets = pc.subtract(offsets, start)
+    if vocab_tokens.type != tokens.type:
+        vocab_tokens = vocab_tokens.cast(tokens.type)
+
+    ids = pc.take(vocab_ids, pc.index_in(tokens, value_set=vocab_tokens))
+    if unk_id is not None and ids.null_count > tokens.null_count:
+        # null tokens stay null, only out of vocab tokens become <unk>
+        ids = pc.if_else(
+            pc.is_valid(tokens), pc.fill_null(ids, unk_id), pa.scalar(None, ids.type)
+        )
+
+    return pa.LargeListArray.from_arrays(offsets, ids, mask=column.is_null())
+
+
+def _concat_list_columns(columns: List[pa.LargeListArray]) -> pa.LargeListArray:
+    """Concatenate large_list columns of ids row by row, dropping null ids
+
+    Parameters
+    ----------
+
+    columns : List[PyArrow LargeListArray]
+        equal length list columns sharing an id type, concatenated
+        in the given order
+
+    Returns
+    -------
+
+    PyArrow LargeListArray
+        a single list per row holding the non-null ids of every column.
+        Null lists are treated as empty
+    """
+    row_count = len(columns[0])
+    parts = []
+    for column in columns:
+        # flatten skips the null rows, the null ids are then dropped and the
+        # row boundaries are moved to index the remaining ids
+        flat = column.flatten()
+        bounds = np.zeros(row_count + 1, dtype=np.int64)
+        np.cumsum(pc.list_value_length(column).fill_null(0), out=bounds[1:])
+        kept_before = np.zeros(len(flat) + 1, dtype=np.int64)
+        np.cumsum(flat.is_valid().to_numpy(zero_copy_only=False), out=kept_before[1:])
+        parts.append((flat.drop_null().to_numpy(), kept_before[bounds]))
+
+    lengths = [np.diff(kept_bounds) for _, kept_bounds in parts]
+    offsets = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.sum(lengths, axis=0), out=offsets[1:])
+
+    # Scatter each column's ids after the ids of the previous columns in every row
+    values = np.empty(offsets[-1], dtype=parts[0][0].dtype)
+    starts = offsets[:-1].copy()
+    for (ids, kept_bounds), length in zip(parts, lengths):
+        rows = np.repeat(np.arange(row_count), length)
+        values[starts[rows] + np.arange(len(ids)) - kept_bounds[rows]] = ids
+        starts += length
+
+    return pa.LargeListArray.from_arrays(
+        pa.array(offsets), pa.array(values, type=columns[0].type.value_type)
+    )
 
 
 class VocabEncoder(Step):
@@ -51,6 +147,13 @@ class VocabEncoder(Step):
     retain_input_fields : Optional[bool]
         If True, will retain the original contents of the fields specified in
         `fields` under the new names of: `vocabencoder__<field>`
+    id_dtype : Optional[PyArrow DataType]
+        integer type of the encoded ids, defaults to int64. A narrower
+        type such as int16 or int32 shrinks the output when every id
+        of the vocab fits in it
+    cores : Optional[int]
+        number of threads used to encode slices of rows concurrently,
+        defaults to the number of available CPU cores
     """
 
     def __init__(
@@ -60,6 +163,8 @@ class VocabEncoder(Step):
         id_to_token: dict = None,
         concat_fields: bool = False,
         retain_input_fields: bool = False,
+        id_dtype: pa.DataType = None,
+        cores: Optional[int] = None,
     ):
         """Constructor method
         """
@@ -80,9 +185,24 @@ class VocabEncoder(Step):
             self.mapping = {token: int(id) for id, token in id_to_token.items()}
 
         self.concat_fields = concat_fields
+
+        self.id_dtype = pa.int64()
+        if id_dtype:
+            if not pa.types.is_integer(id_dtype):
+                raise TypeError("id_dtype must be a PyArrow integer type")
+            self.id_dtype = id_dtype
+
+        self.cores = cpu_count()
+        if cores:
+            self.cores = cores
+
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }  # Default write config
 
     @abstractmethod
@@ -122,6 +242,13 @@ class CPUVocabEncoder(VocabEncoder):
     retain_input_fields : Optional[bool]
         If True, will retain the original contents of the fields specified in
         `fields` under the new names of: `vocabencoder__<field>`
+    id_dtype : Optional[PyArrow DataType]
+        integer type of the encoded ids, defaults to int64. A narrower
+        type such as int16 or int32 shrinks the output when every id
+        of the vocab fits in it
+    cores : Optional[int]
+        number of threads used to encode slices of rows concurrently,
+        defaults to the number of available CPU cores
     """
 
     def __init__(self, *args, **kwargs):
@@ -174,6 +301,8 @@ class CPUVocabEncoder(VocabEncoder):
         AttributeError
             The vocab (id_to_token) wasn't supplied
             either at object creation or to the run method
+        ArrowInvalid
+            An id of the vocab doesn't fit in id_dtype
         TypeError
             The run method was not supplied a PyArrow Table
         """
@@ -182,13 +311,17 @@ class CPUVocabEncoder(VocabEncoder):
         validate_pyarrow_table(data=data)
         validate_list_str_cols(fields=self.fields, data=data)
 
-        # Retain original columns if needed - doing it here before any PyArrow Table
-        # chunking takes place
-        df = (
-            pl.from_arrow(data)
-            .pipe(retain_inputs, self.retain_input_fields, self.fields, self.__class__.__name__)
-        )
-        data = df.to_arrow()
+        # Upstream steps commonly hand over many-chunked columns, combine
+        # them once so the per field flatten and lookup work on one buffer
+        if any(column.num_chunks > 1 for column in data.columns):
+            data = data.combine_chunks()
+
+        # Retain original columns if needed
+        if self.retain_input_fields:
+            for field in self.fields:
+                data = data.append_column(
+                    f"{self.__class__.__name__}_input__{field}", data.column(field)
+                )
 
         # Check if vocab was passed through the artifacts dict
         if artifacts:
@@ -218,77 +351,84 @@ class CPUVocabEncoder(VocabEncoder):
 
         # Map tokens to ids using the supplied vocab.
         # If a token encountered isn't in the vocab, it defaults to
-        # the <unk> value. The field passed is renamed to 'X'
-
-        # This step is memory intensive, so the data is split into
-        # 128 MB chunks and operated upon to avoid OoM errors
-        data_size = getsizeof(data) * 1e-6
-        chunks = ceil(data_size / 128)
-        column_order = data.column_names
-        tables = chunk_pyarrow_table(
-            data=data, row_count=data.num_rows, min_batches=chunks
-        )
-
-        self.mapping[None] = None
-
-        for i, table in enumerate(tables):
-            chunk_df = pl.from_arrow(table)
-            # create a unique id for each row in the chunk
-            # this is needed for exploding and grouping
-            # the data for efficinet execution
-            index_list = np.arange(0, chunk_df.height)
-            index_col = pl.Series(index_list)
-            chunk_df = chunk_df.with_columns(index_col.alias("unique_id"))
-
-            for field in self.fields:
-                meta_df = chunk_df.drop(field)
-                tmp_df = (
-                    chunk_df.select(["unique_id", field])
-                    .explode(field)
-                    .with_columns(
-                        pl.col(field).replace(
-                            self.mapping, default=self.unk_id, return_dtype=pl.Int64()
-                        )
-                    )
-                    .group_by("unique_id", maintain_order=True)
-                    .agg(pl.col(field))
-                )
-
-                chunk_df = meta_df.join(tmp_df, on="unique_id", how="left")
-            if i == 0:
-                df = chunk_df.select(*column_order)
-            else:
-                df = df.vstack(chunk_df.select(*column_order))
+        # the <unk> value. Each list column is flattened to its token
+        # values, looked up against the vocab in a single vectorized
+        # pass and rebuilt with the original list offsets
+        vocab_tokens = pa.array(list(self.mapping.keys()), type=pa.large_string())
+        vocab_ids = pa.array(list(self.mapping.values()), type=pa.int64())
+        if self.id_dtype != pa.int64():
+            # a safe cast, raises if the vocab has ids out of range
+            vocab_ids = vocab_ids.cast(self.id_dtype)
+
+        for field in self.fields:
+            encoded = self._encode_field(data.column(field), vocab_tokens, vocab_ids)
+            data = data.set_column(data.schema.get_field_index(field), field, encoded)
 
         # concat the fields if desired
         if self.concat_fields and len(self.fields) > 1:
-            # Concatenate the values in the fields.
-            # Fields at this point are assumed to be large lists
-
-            current_field = self.fields[0]
-            for i in range(len(self.fields) - 1):
-                next_field = self.fields[i + 1]
-                df = df.with_columns(
-                    pl.col(current_field)
-                    .list.concat(next_field)
-                    .list.drop_nulls()
-                    .alias("X")
-                ).drop(next_field)
-                current_field = "X"
-            df = df.drop(self.fields[0])
-
-            # concat field is called 'X', rename if
-            # other name provided, defaults to 'X'
-            df = df.rename({"X": self.field_rename})
+            # Concatenate the values in the fields into a single column
+            # called field_rename, defaults to 'X'
+            concatenated = _concat_list_columns(
+                [data.column(field).combine_chunks() for field in self.fields]
+            )
+            data = data.drop_columns(self.fields).append_column(
+                self.field_rename, concatenated
+            )
 
         # if concat was not run and a single field was provided
         # the field can be renamed
         elif len(self.fields) == 1:
-            df = df.rename({self.fields[0]: self.field_rename})
+            data = data.rename_columns(
+                [
+                    self.field_rename if name == self.fields[0] else name
+                    for name in data.column_names
+                ]
+            )
+
+        return StepResult(data, None)
 
-        data = df.to_arrow()
+    def _encode_field(
+        self, column: pa.ChunkedArray, vocab_tokens: pa.Array, vocab_ids: pa.Array
+    ) -> pa.ChunkedArray:
+        """Map a list<string> column to vocab ids
 
-        return (data, None)
+        Parameters
+        ----------
+
+        column : PyArrow ChunkedArray
+            list of string tokens per row
+        vocab_tokens : PyArrow Array
+            the tokens of the vocab
+        vocab_ids : PyArrow Array
+            the ids of the vocab, aligned with vocab_tokens
+
+        Returns
+        -------
+
+        PyArrow ChunkedArray
+            the ids of the tokens of each row
+        """
+        # A lookup kernel runs single threaded over a column, so larger inputs
+        # are split into row slices encoded concurrently. Arrow releases
+        # the GIL while running its compute kernels
+        n_slices = min(self.cores, ceil(len(column) / _MIN_ROWS_PER_SLICE))
+        if n_slices > 1:
+            slice_size = ceil(len(column) / n_slices)
+            with ThreadPoolExecutor(max_workers=n_slices) as executor:
+                slices = executor.map(
+                    lambda offset: _encode_list_column(
+                        column=column.slice(offset, slice_size),
+                        vocab_tokens=vocab_tokens,
+                        vocab_ids=vocab_ids,
+                        unk_id=self.unk_id,
+                    ),
+                    range(0, len(column), slice_size),
+                )
+                return pa.chunked_array(list(slices))
+
+        return pa.chunked_array(
+            [_encode_list_column(column, vocab_tokens, vocab_ids, unk_id=self.unk_id)]
+        )
 
     def get_parameters(self):
         """Retrive the vocab encoder object configuration
@@ -302,4 +442,5 @@ class CPUVocabEncoder(VocabEncoder):
         """
         params = vars(self).copy()
         params.pop("mapping")
+        params["id_dtype"] = str(self.id_dtype)
         return params
@@ -3,19 +3,52 @@
 import os
 import tracemalloc
 from abc import ABCMeta, abstractmethod
-from datetime import datetime
-from typing import List, Literal, Tuple, TypedDict, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter_ns
+from typing import List, Literal, NamedTuple, Optional, Tuple, TypedDict, Union
 
 import pyarrow as pa
 
 from bardi.data import Dataset, write_file
 
 
-class DataWriteConfig(TypedDict):
+def _elapsed_since(start_ns: int) -> timedelta:
+    """Time elapsed since a perf_counter_ns reading, as a timedelta so it is
+    reported in the same H:MM:SS.ffffff format as before"""
+    return timedelta(microseconds=(perf_counter_ns() - start_ns) // 1000)
+
+
+def _condense_params(params: dict) -> dict:
+    """Drop the attributes set to None or False from a parameters dictionary"""
+    return {
+        attribute: value
+        for attribute, value in params.items()
+        if value is not None and value is not False
+    }
+
+
+class _RequiredDataWriteConfig(TypedDict):
     data_format: str
     data_format_args: Union[dict, None]
 
 
+class DataWriteConfig(_RequiredDataWriteConfig, total=False):
+    # Rows per parquet row group, bounds the writer's encoded buffers
+    row_group_size: int
+
+
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+
+class StepResult(NamedTuple):
+    """The data and artifacts returned by a step's run method.
+    Being a tuple, it can be unpacked like the plain tuples steps return"""
+
+    data: Union[pa.Table, None]
+    artifacts: Union[dict, None]
+
+
 class Step(metaclass=ABCMeta):
     """Blueprint for creating new steps for data pre-processing pipelines"""
 
@@ -24,7 +57,11 @@ class Step(metaclass=ABCMeta):
         """Constructor method"""
         self._data_write_config: DataWriteConfig = {
             "data_format": "parquet",
-            "data_format_args": {"compression": "snappy", "use_dictionary": False},
+            "data_format_args": {
+                "compression": "zstd",
+                "compression_level": 3,
+                "use_dictionary": True,
+            },
         }  # Default write config
 
     @abstractmethod
@@ -32,7 +69,7 @@ class Step(metaclass=ABCMeta):
         self,
         data: pa.Table,
         artifacts: dict,
-    ) -> Tuple[Union[pa.Table, None], Union[dict, None]]:
+    ) -> StepResult:
         """Implement a run method in the step that will be called by the
         pipeline's run_pipeline method.
 
@@ -47,7 +84,8 @@ class Step(metaclass=ABCMeta):
 
         Returns
         -------
-        Tuple[Union[pa.Table, None], Union[dict, None]]
+        StepResult
+            A StepResult, or a plain tuple, of data and artifacts.
             If the method performs a transformation of data then return
             the data as a PyArrow table. This will replace the pipeline
             object's processed_data attribute. If the method creates new artifacts
@@ -105,19 +143,37 @@ class Step(metaclass=ABCMeta):
             PyArrow Table of data.
         data_filename : Union[str, None]
             Overwrite default file name (no filetype extension).
+
+        Note
+        ----
+
+        Parquet files are written in row groups of the write config's
+        `row_group_size` rows (64k by default) unless `row_group_size`
+        is given in its `data_format_args`.
         """
         # Add the filename with the appropriate filetype extension to the write path
         if not data_filename:
             data_filename = f"{self.__class__.__name__}Data"
-        file_path = os.path.join(
-            write_path, (f'{data_filename}.{self._data_write_config["data_format"]}')
-        )
+        data_format = self._data_write_config["data_format"]
+        file_path = os.path.join(write_path, f"{data_filename}.{data_format}")
+
+        data_format_args = self._data_write_config["data_format_args"] or {}
+        if data_format == "parquet":
+            # Parquet buffers a whole encoded row group before flushing it, keep
+            # row groups bounded so large tables don't hold everything at once
+            data_format_args = {
+                "row_group_size": self._data_write_config.get(
+                    "row_group_size", DEFAULT_ROW_GROUP_SIZE
+                ),
+                **data_format_args,
+            }
+
         # Call the data handler write_file function
         write_file(
             data=data,
             path=file_path,
-            format=self._data_write_config["data_format"],
-            **self._data_write_config["data_format_args"],
+            format=data_format,
+            **data_format_args,
         )
 
     def write_artifacts(self, write_path: str, artifacts: Union[dict, None]):
@@ -159,6 +215,12 @@ class Pipeline:
         file types. Default will save data as parquet files.
     data_filename : str
         Supply a filename for the final output data.
+    profile_memory : Optional[bool]
+        If True, trace every Python allocation of each step with tracemalloc
+        to report its peak memory. This slows allocation-heavy steps down
+        considerably, so otherwise no memory is recorded and only the run
+        time of each step is. Defaults to True when write_outputs is 'debug'
+        and False otherwise.
     """
 
     def __init__(
@@ -168,6 +230,7 @@ class Pipeline:
         write_outputs: Literal["pipeline-outputs", "debug", False] = "pipeline-outputs",
         data_write_config: DataWriteConfig = None,
         data_filename: str = "bardi_processed_data",
+        profile_memory: Optional[bool] = None,
     ):
         """Constructor Method"""
         # Reference a bardi dataset object that the pipeline will operate on
@@ -175,10 +238,16 @@ class Pipeline:
 
         # Pipeline configuration
         self.steps: List[Step] = []
+        # Labels identifying each step in the performance and parameter
+        # records, numbered so two steps of the same class don't collide
+        self.step_labels: List[str] = []
         self.num_steps = 0
         self.write_outputs = write_outputs
         self.write_path = write_path
         self.data_filename = data_filename
+        self.profile_memory = write_outputs == "debug"
+        if profile_memory is not None:
+            self.profile_memory = profile_memory
 
         # File writing configuration
         if data_write_config:
@@ -186,7 +255,11 @@ class Pipeline:
         else:
             self.data_write_config = {
                 "data_format": "parquet",
-                "data_format_args": {"compression": "snappy", "use_dictionary": False},
+                "data_format_args": {
+                    "compression": "zstd",
+                    "compression_level": 3,
+                    "use_dictionary": True,
+                },
             }  # Default config, but can be overwritten
         if write_outputs:
             if not os.path.isdir(self.write_path):
@@ -217,6 +290,7 @@ class Pipeline:
             step.set_write_config(data_config=self.data_write_config)
             self.steps.append(step)
             self.num_steps += 1
+            self.step_labels.append(f"{type(step).__name__}#{self.num_steps}")
         else:
             raise TypeError("Only objects of type Step may be added to " "a bardi pipeline.")
 
@@ -235,71 +309,104 @@ class Pipeline:
                 "your data."
             )
 
+        # Data files are written on a background thread so that encoding and
+        # flushing one step's output overlaps with the next step's compute.
+        # Tables are immutable so they can be handed over without a copy.
+        # Artifacts are written synchronously as later steps may modify them.
+        pending_writes = []
+
+        # Resolve the write configuration once rather than on every step
+        write_debug = self.write_outputs == "debug"
+        write_final = self.write_outputs == "pipeline-outputs"
+        write_artifacts = bool(self.write_outputs)
+
         # For each step of the pipeline, call its run method
-        pipeline_start_time = datetime.now()
-        for step_position, step in enumerate(self.steps, start=1):
-            # Call the run method and time the execution
-            step_start_time = datetime.now()
-            if self.write_outputs == "debug":
-                tracemalloc.start()
-            results = step.run(data=self.processed_data, artifacts=self.artifacts)
-            if self.write_outputs == "debug":
-                step_max_mem = tracemalloc.get_traced_memory()[1] / 1000000
-                tracemalloc.stop()
-            step_end_time = datetime.now()
-            step_run_time = step_end_time - step_start_time
-
-            # Record the performance
-            self.performance[str(type(step))] = {
-                "time": str(step_run_time),
-            }
-            if self.write_outputs == "debug":
-                self.performance[str(type(step))]["memory (MB)"] = str(step_max_mem)
-                print(f"{str(type(step))} run time: {step_run_time}")
-                print(f"{str(type(step))} max memory (MB): {step_max_mem}")
+        pipeline_start_ns = perf_counter_ns()
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            for step_position, (step, step_label) in enumerate(
+                zip(self.steps, self.step_labels), start=1
+            ):
+                # Call the run method and time the execution
+                step_start_ns = perf_counter_ns()
+                if self.profile_memory:
+                    tracemalloc.start()
+                results = step.run(data=self.processed_data, artifacts=self.artifacts)
+                if self.profile_memory:
+                    step_max_mem = tracemalloc.get_traced_memory()[1] / 1000000
+                    tracemalloc.stop()
+                step_run_time = _elapsed_since(step_start_ns)
+
+                # Record the performance
+                self.performance[step_label] = {
+                    "time": str(step_run_time),
+                }
+                if self.profile_memory:
+                    self.performance[step_label]["memory (MB)"] = str(step_max_mem)
+                if write_debug:
+                    print(f"{step_label} run time: {step_run_time}")
+                    if self.profile_memory:
+                        print(f"{step_label} max memory (MB): {step_max_mem}")
+
+                if not isinstance(results, tuple):
+                    raise TypeError(
+                        "Pipeline expected step to return a tuple of "
+                        "PyArrow Table of data and a dictionary of "
+                        "artifacts. If the step doesn't return one of "
+                        "these, that position in the tuple can be "
+                        "empty, but it still needs to return a tuple."
+                    )
+                step_data, step_artifacts = results
+
+                if isinstance(step_data, pa.Table):
+                    # A step that hands back its input table untouched (e.g. one
+                    # that only produces artifacts) has no new data to write
+                    data_changed = step_data is not self.processed_data
 
-            if isinstance(results, tuple):
-                if isinstance(results[0], pa.Table):
                     # Set the pipeline's processed_data attribute to the newest result
-                    self.processed_data = results[0]
+                    self.processed_data = step_data
 
                     # Write the step's data output to a file if pipeline is configured
-                    # to do so
-                    if self.write_outputs == "debug":
-                        step.write_data(write_path=self.write_path, data=self.processed_data)
-                    elif (
-                        step_position == self.num_steps
-                        and self.write_outputs == "pipeline-outputs"
-                    ):
-                        step.write_data(
-                            write_path=self.write_path,
-                            data=self.processed_data,
-                            data_filename=self.data_filename,
+                    # to do so. Debug outputs are named by the step label so two
+                    # steps of the same class don't overwrite each other's file
+                    if write_debug and data_changed:
+                        pending_writes.append(
+                            io_pool.submit(
+                                step.write_data,
+                                write_path=self.write_path,
+                                data=self.processed_data,
+                                data_filename=f"{step_label}Data",
+                            )
+                        )
+                    elif write_final and step_position == self.num_steps:
+                        pending_writes.append(
+                            io_pool.submit(
+                                step.write_data,
+                                write_path=self.write_path,
+                                data=self.processed_data,
+                                data_filename=self.data_filename,
+                            )
                         )
-                if isinstance(results[1], dict):
+                if isinstance(step_artifacts, dict):
                     # If artifacts were returned by the step, add them to
                     # the pipeline's total set of artifacts
-                    self.artifacts = {**self.artifacts, **results[1]}
+                    self.artifacts.update(step_artifacts)
 
                     # Write the step's artifacts to files if pipeline is configured
                     # to do so
-                    if self.write_outputs:
-                        step.write_artifacts(write_path=self.write_path, artifacts=self.artifacts)
-            else:
-                raise TypeError(
-                    "Pipeline expected step to return a tuple of "
-                    "PyArrow Table of data and a dictionary of "
-                    "artifacts. If the step doesn't return one of "
-                    "these, that position in the tuple can be "
-                    "empty, but it still needs to return a tuple."
-                )
+                    if write_artifacts:
+                        step.write_artifacts(
+                            write_path=self.write_path, artifacts=self.artifacts
+                        )
+
+        # Surface any error raised while writing in the background
+        for write in pending_writes:
+            write.result()
 
         # Record the total pipeline performance
-        pipeline_end_time = datetime.now()
-        pipeline_run_time = pipeline_end_time - pipeline_start_time
-        if self.write_outputs == "debug":
+        pipeline_run_time = _elapsed_since(pipeline_start_ns)
+        if write_debug:
             print(f"Pipeline run time: {pipeline_run_time}")
-        self.performance[str(type(self))] = str(pipeline_run_time)
+        self.performance[type(self).__name__] = str(pipeline_run_time)
 
     def get_parameters(self, condensed: bool = True) -> dict:
         """Returns the parameters of the pipeline's dataset and parameters of each step.
@@ -324,26 +431,16 @@ class Pipeline:
         if self.dataset:
             dataset_params = self.dataset.get_parameters()
             if condensed:
-                condensed_params = {}
-                for attribute in dataset_params.keys():
-                    if dataset_params[attribute] not in [False, None]:
-                        condensed_params[attribute] = dataset_params[attribute]
-                pipeline_params["dataset"][str(type(self.dataset))] = condensed_params
-            else:
-                pipeline_params["dataset"][str(type(self.dataset))] = dataset_params
+                dataset_params = _condense_params(dataset_params)
+            pipeline_params["dataset"][str(type(self.dataset))] = dataset_params
 
         # Get parameters for each step in the pipeline
-        for i, step in enumerate(self.steps):
+        for step, step_label in zip(self.steps, self.step_labels):
             step_params = step.get_parameters()
 
             if condensed:
-                condensed_params = {}
-                for attribute in step_params.keys():
-                    if step_params[attribute] not in [False, None]:
-                        condensed_params[attribute] = step_params[attribute]
-                pipeline_params["steps"][str(type(step))] = condensed_params
-            else:
-                pipeline_params["steps"][str(type(step))] = step_params
+                step_params = _condense_params(step_params)
+            pipeline_params["steps"][step_label] = step_params
 
         # Get the pipeline performance
         pipeline_params["performance"] = self.performance
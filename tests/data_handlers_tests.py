@@ -1,10 +1,11 @@
+import tempfile
 import unittest
 from json import dumps
-from pathlib import Path
 
 from duckdb import connect
 from pandas import DataFrame
 from pyarrow import Table, table, array
+import pyarrow.parquet as pq
 
 import bardi
 from bardi import data
@@ -14,225 +15,135 @@ class TestDataHandlers(unittest.TestCase):
     """Tests the functionality of the functions in bardi.data.data_handlers
     that create bardi Dataset objects from various sources"""
 
-    def test_dataset_from_file(self):
-        """Set of tests to ensure that the data_handlers.from_file
-        function is correctly loading data and creating
-        bardi Dataset objects"""
-
-        # ======== Set-up ========
-        repo_path = Path().resolve()
+    @classmethod
+    def setUpClass(cls):
+        """Build the test data and write the test files once for all tests"""
+        cls.test_data_dir = tempfile.TemporaryDirectory()
+        cls.test_data_path = cls.test_data_dir.name
 
         d = {"col1": [1, 2, 3, 4], "col2": ["str1", "str2", "str3", "str4"]}
-        test_df = DataFrame(data=d)
+        cls.test_df = DataFrame(data=d)
+        cls.test_table = table([array(d["col1"]), array(d["col2"])], names=list(d.keys()))
+
+        cls.parquet_path = f"{cls.test_data_path}/test_data.parquet"
+        # The test table holds the same data, write it without going through
+        # pandas and skip the compression and statistics the tests don't read
+        pq.write_table(
+            cls.test_table, cls.parquet_path, compression="none", write_statistics=False
+        )
+        cls.csv_path = f"{cls.test_data_path}/test_data.csv"
+        cls.test_df.to_csv(cls.csv_path, index=False)
+
+        # Create the test table in an in-memory database with one insert,
+        # then copy it into a database file for from_duckdb to open
+        cls.test_db_path = f"{cls.test_data_path}/test_db.duckdb"
+        cls.test_conn = connect(":memory:")
+        setup_query = f"""
+                      CREATE TABLE test(
+                          col1 INTEGER,
+                          col2 VARCHAR
+                      );
 
-        # ======== Parquet Filetype ========
-        # Parquet Set-up
-        parquet_path = f"{repo_path}/tests/test_data/test_data.parquet"
-        test_df.to_parquet(parquet_path, engine="pyarrow", index=False)
+                      INSERT INTO test VALUES
+                          (1, 'str1'),
+                          (2, 'str2'),
+                          (3, 'str3'),
+                          (4, 'str4');
 
-        # Non-Chunked Dataset Test
-        p_dataset_obj = data.from_file(source=parquet_path, format="parquet")
+                      ATTACH '{cls.test_db_path}' AS test_db;
+                      CREATE TABLE test_db.test AS SELECT * FROM test;
+                      DETACH test_db;
+                      """
+        cls.test_conn.execute(setup_query)
 
-        # bardi Dataset object was created and returned?
-        self.assertTrue(
-            isinstance(p_dataset_obj, bardi.Dataset),
-            ("Object created and/or returned by the function" " was not a bardi Dataset object"),
-        )
-        # Data is an Arrow Table?
-        self.assertTrue(
-            isinstance(p_dataset_obj.data, Table),
-            ("The data referenced in the object is not" " an Arrow Table"),
-        )
-        # Recorded data length matches the source?
-        self.assertEqual(
-            p_dataset_obj.origin_row_count,
-            test_df.shape[0],
-            ("Recorded origin row count in the Dataset object" " does not match the test data"),
-        )
-        # Data length matches the source?
-        self.assertEqual(
-            p_dataset_obj.data.num_rows,
-            test_df.shape[0],
-            ("Data length in Arrow Table does not match" " the test data"),
-        )
-        # Columns are correct?
-        self.assertEqual(
-            p_dataset_obj.data.column_names,
-            list(test_df.columns),
-            ("Columns of Arrow Table do not match" " the columns in the test data"),
-        )
-        # Data types are correct
-        # Format of source recorded correctly?
-        self.assertEqual(
-            p_dataset_obj.origin_format,
-            "parquet",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
-        )
-        # Data source path recorded correctly?
-        self.assertEqual(
-            p_dataset_obj.origin_file_path,
-            parquet_path,
-            ("Origin file path recorded does" " not match the test data path"),
-        )
+    @classmethod
+    def tearDownClass(cls):
+        """Close the in-memory database and remove the test files"""
+        cls.test_conn.close()
+        cls.test_data_dir.cleanup()
 
-        # Chunked Dataset Test
-        p_chunked_dataset_obj = data.from_file(
-            source=parquet_path, format="parquet", min_batches=2
-        )
+    def _check_dataset(self, dataset_obj, rows, columns, origin_format, chunked=False):
+        """Check that a bardi Dataset object was created with data of the
+        expected length and columns, recording the format of its source"""
 
         # bardi Dataset object was created and returned?
-        self.assertTrue(
-            isinstance(p_chunked_dataset_obj, bardi.Dataset),
-            (
-                "Object created and/or returned by the function"
-                " (with batches) was not a bardi Dataset object"
-            ),
-        )
-        # Data is a List of Arrow Tables?
-        self.assertTrue(
-            isinstance(p_chunked_dataset_obj.data, list),
-            ("The data attribute in the object" " is not referencing a list"),
+        self.assertIsInstance(
+            dataset_obj,
+            bardi.Dataset,
+            ("Object created and/or returned by the function" " was not a bardi Dataset object"),
         )
-        for test_chunk in p_chunked_dataset_obj.data:
-            self.assertTrue(
-                isinstance(test_chunk, Table),
-                ("The contents of the data list" " are not Arrow Tables"),
+        if chunked:
+            # Data is a List of Arrow Tables?
+            self.assertIsInstance(
+                dataset_obj.data,
+                list,
+                ("The data attribute in the object" " is not referencing a list"),
             )
-        # Total length of data matches the source data?
-        total_data_length = sum([table.num_rows for table in p_chunked_dataset_obj.data])
-        self.assertEqual(
-            total_data_length,
-            p_chunked_dataset_obj.origin_row_count,
-            ("Total length of the data in the list" " does not match recorded length"),
-        )
-        self.assertEqual(
-            total_data_length,
-            test_df.shape[0],
-            ("Total length of the data in the list" " does not match the query results"),
-        )
-        # Columns are correct?
-        for test_chunk in p_chunked_dataset_obj.data:
+            test_chunks = dataset_obj.data
+        else:
+            test_chunks = [dataset_obj.data]
+        for test_chunk in test_chunks:
+            # Data is an Arrow Table?
+            self.assertIsInstance(
+                test_chunk,
+                Table,
+                ("The data referenced in the object" " is not an Arrow Table"),
+            )
+            # Columns are correct?
             self.assertEqual(
                 test_chunk.column_names,
-                list(test_df.columns),
-                ("Columns of Arrow Table do not match" " the columns in the query results"),
+                columns,
+                ("Columns of Arrow Table do not match" " the columns in the test data"),
             )
-        # Format of source recorded correctly?
-        self.assertEqual(
-            p_chunked_dataset_obj.origin_format,
-            "parquet",
-            ("Origin format incorrectly recorded in" " the bardi Dataset object"),
-        )
-        # Data source path recorded correctly?
-        self.assertEqual(
-            p_dataset_obj.origin_file_path,
-            parquet_path,
-            ("Origin file path recorded" " does not match the test data path"),
-        )
-
-        # ======== CSV Filetype ========
-        # CSV Set-up
-        csv_path = f"{repo_path}/tests/test_data/test_data.csv"
-        test_df.to_csv(csv_path, index=False)
-
-        # Non-Chunked Dataset Test
-        c_dataset_obj = data.from_file(source=csv_path, format="csv")
-
-        # bardi Dataset object was created and returned?
-        self.assertTrue(
-            isinstance(c_dataset_obj, bardi.Dataset),
-            ("Object created and/or returned by the function" " was not a bardi Dataset object"),
-        )
-        # Data is an Arrow Table?
-        self.assertTrue(
-            isinstance(c_dataset_obj.data, Table),
-            ("The data referenced in the object" " is not an Arrow Table"),
-        )
         # Recorded data length matches the source?
         self.assertEqual(
-            c_dataset_obj.origin_row_count,
-            test_df.shape[0],
+            dataset_obj.origin_row_count,
+            rows,
             ("Recorded origin row count in the Dataset object" " does not match the test data"),
         )
-        # Data length matches the source?
+        # Total length of data matches the source?
         self.assertEqual(
-            c_dataset_obj.data.num_rows,
-            test_df.shape[0],
-            ("Data length in Arrow Table" " does not match the test data"),
+            sum(test_chunk.num_rows for test_chunk in test_chunks),
+            rows,
+            ("Total length of the data" " does not match the test data"),
         )
-        # Columns are correct?
-        self.assertEqual(
-            c_dataset_obj.data.column_names,
-            list(test_df.columns),
-            ("Columns of Arrow Table do not match" " the columns in the test data"),
-        )
-        # Data types are correct
         # Format of source recorded correctly?
         self.assertEqual(
-            c_dataset_obj.origin_format,
-            "csv",
+            dataset_obj.origin_format,
+            origin_format,
             ("Origin format incorrectly recorded" " in the bardi Dataset object"),
         )
-        # Data source path recorded correctly?
-        self.assertEqual(
-            c_dataset_obj.origin_file_path,
-            csv_path,
-            ("Origin file path recorded does not match" " the test data path"),
-        )
 
-        # Chunked Dataset Test
-        c_chunked_dataset_obj = data.from_file(source=csv_path, format="csv", min_batches=2)
+    def test_dataset_from_file(self):
+        """Set of tests to ensure that the data_handlers.from_file
+        function is correctly loading data and creating
+        bardi Dataset objects"""
 
-        # bardi Dataset object was created and returned?
-        self.assertTrue(
-            isinstance(c_chunked_dataset_obj, bardi.Dataset),
-            (
-                "Object created and/or returned by"
-                " the function (with batches) was"
-                " not a bardi Dataset object"
-            ),
-        )
-        # Data is a List of Arrow Tables?
-        self.assertTrue(
-            isinstance(c_chunked_dataset_obj.data, list),
-            ("The data attribute in the object" " is not referencing a list"),
-        )
-        for test_chunk in c_chunked_dataset_obj.data:
-            self.assertTrue(
-                isinstance(test_chunk, Table),
-                ("The contents of the data list" " are not Arrow Tables"),
+        rows = self.test_df.shape[0]
+        columns = list(self.test_df.columns)
+
+        for file_format, file_path in [("parquet", self.parquet_path), ("csv", self.csv_path)]:
+            # Non-Chunked Dataset Test
+            dataset_obj = data.from_file(source=file_path, format=file_format)
+            self._check_dataset(dataset_obj, rows, columns, file_format)
+            # Data source path recorded correctly?
+            self.assertEqual(
+                dataset_obj.origin_file_path,
+                file_path,
+                ("Origin file path recorded does" " not match the test data path"),
             )
-        # Total length of data matches the source data?
-        total_data_length = sum([table.num_rows for table in c_chunked_dataset_obj.data])
-        self.assertEqual(
-            total_data_length,
-            c_chunked_dataset_obj.origin_row_count,
-            ("Total length of the data in the list" " does not match recorded length"),
-        )
-        self.assertEqual(
-            total_data_length,
-            test_df.shape[0],
-            ("Total length of the data in the list" " does not match the query results"),
-        )
-        # Columns are correct?
-        for test_chunk in c_chunked_dataset_obj.data:
+
+            # Chunked Dataset Test
+            chunked_dataset_obj = data.from_file(
+                source=file_path, format=file_format, min_batches=2
+            )
+            self._check_dataset(chunked_dataset_obj, rows, columns, file_format, chunked=True)
+            # Data source path recorded correctly?
             self.assertEqual(
-                test_chunk.column_names,
-                list(test_df.columns),
-                ("Columns of Arrow Table do not match the columns" " in the query results"),
+                chunked_dataset_obj.origin_file_path,
+                file_path,
+                ("Origin file path recorded does" " not match the test data path"),
             )
-        # Format of source recorded correctly?
-        self.assertEqual(
-            c_chunked_dataset_obj.origin_format,
-            "csv",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
-        )
-        # Data source path recorded correctly?
-        self.assertEqual(
-            c_dataset_obj.origin_file_path,
-            csv_path,
-            ("Origin file path recorded does not match" " the test data path"),
-        )
 
     def test_dataset_from_duckdb(self):
         """Set of tests to ensure that the data_handlers.from_duckdb
@@ -240,23 +151,7 @@ class TestDataHandlers(unittest.TestCase):
         bardi Dataset objects"""
 
         # ======== Set-up ========
-        # Connect to the test database file
-        test_db_path = f"{Path().resolve()}/tests/test_data/test_db.duckdb"
-        test_conn = connect(test_db_path)
-
-        # Create test table
-        setup_query = """
-                      CREATE OR REPLACE TABLE test(
-                          col1 INTEGER,
-                          col2 VARCHAR
-                      );
-
-                      INSERT INTO test VALUES (1, 'str1');
-                      INSERT INTO test VALUES (2, 'str2');
-                      INSERT INTO test VALUES (3, 'str3');
-                      INSERT INTO test VALUES (4, 'str4');
-                      """
-        test_conn.execute(setup_query)
+        test_db_path = self.test_db_path
 
         # ======== Testing ========
         test_query = """
@@ -266,303 +161,65 @@ class TestDataHandlers(unittest.TestCase):
                      FROM test;
                      """
 
-        # Returning test query results as a Pandas DataFrame
-        # for comparison to what the data_handler function is doing
-        test_df = test_conn.execute(test_query).fetch_df()
-
-        # A new connection to the db is created in the data_handler
-        # function, so closing the one used for setup
-        test_conn.close()
-
-        # ======== Non-Chunked Dataset Tests ========
-        dataset_obj = data.from_duckdb(path=test_db_path, query=test_query)
-
-        # bardi Dataset object was created and returned?
-        self.assertTrue(
-            isinstance(dataset_obj, bardi.Dataset),
-            ("Object created and/or returned by the function" " was not a bardi Dataset object"),
-        )
-        # Data is an Arrow Table?
-        self.assertTrue(
-            isinstance(dataset_obj.data, Table),
-            ("The data referenced in the object" " is not an Arrow Table"),
-        )
-        # Recorded data length matches the source?
-        self.assertEqual(
-            dataset_obj.origin_row_count,
-            test_df.shape[0],
-            (
-                "Recorded origin row count in the Dataset object"
-                " does not match the query results"
-            ),
-        )
-        # Data length matches the source?
-        self.assertEqual(
-            dataset_obj.data.num_rows,
-            test_df.shape[0],
-            ("Data length in Arrow Table does not match" " the query results"),
-        )
-        # Columns are correct?
-        self.assertEqual(
-            dataset_obj.data.column_names,
-            list(test_df.columns),
-            ("Columns of Arrow Table do not match the columns" " in the query results"),
-        )
-        # Data types are correct
-        # Format of source recorded correctly?
-        self.assertEqual(
-            dataset_obj.origin_format,
-            "duckdb",
-            ("Origin format incorrectly recorded in" " the bardi Dataset object"),
-        )
-        # Recorded query matches the test query?
-        self.assertEqual(
-            dataset_obj.origin_query,
-            test_query,
-            (
-                "Origin query recorded incorrectly in the Dataset"
-                " object. It does not match the test query."
-            ),
-        )
-
-        # ======== Chunked Dataset Tests ========
-        chunked_dataset_obj = data.from_duckdb(path=test_db_path, query=test_query, min_batches=2)
+        # Returning test query results from the in-memory database as a
+        # PyArrow Table for comparison to what the data_handler function is doing
+        test_tbl = self.test_conn.execute(test_query).fetch_arrow_table()
 
-        # bardi Dataset object was created and returned?
-        self.assertTrue(
-            isinstance(chunked_dataset_obj, bardi.Dataset),
-            (
-                "Object created and/or returned by the function"
-                " (with batches) was not a bardi Dataset object"
-            ),
-        )
-        # Data is a List of Arrow Tables?
-        self.assertTrue(
-            isinstance(chunked_dataset_obj.data, list),
-            ("The data attribute in the object" " is not referencing a list"),
-        )
-        for test_chunk in chunked_dataset_obj.data:
-            self.assertTrue(
-                isinstance(test_chunk, Table),
-                ("The contents of the data list" " are not Arrow Tables"),
+        for min_batches in [None, 2]:
+            dataset_obj = data.from_duckdb(
+                path=test_db_path, query=test_query, min_batches=min_batches
             )
-        # Total length of data matches the source data?
-        total_data_length = sum([table.num_rows for table in chunked_dataset_obj.data])
-        self.assertEqual(
-            total_data_length,
-            chunked_dataset_obj.origin_row_count,
-            ("Total length of the data in the list" " does not match recorded length"),
-        )
-        self.assertEqual(
-            total_data_length,
-            test_df.shape[0],
-            ("Total length of the data in the list" " does not match the query results"),
-        )
-        # Columns are correct?
-        for test_chunk in chunked_dataset_obj.data:
+            self._check_dataset(
+                dataset_obj,
+                test_tbl.num_rows,
+                test_tbl.column_names,
+                "duckdb",
+                chunked=bool(min_batches),
+            )
+            # Recorded query matches the test query?
             self.assertEqual(
-                test_chunk.column_names,
-                list(test_df.columns),
-                ("Columns of Arrow Table do not match" " the columns in the query results"),
+                dataset_obj.origin_query,
+                test_query,
+                (
+                    "Origin query recorded incorrectly in the Dataset"
+                    " object. It does not match the test query."
+                ),
             )
-        # Format of source recorded correctly?
-        self.assertEqual(
-            dataset_obj.origin_format,
-            "duckdb",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
-        )
-        # Recorded query matches the test query?
-        self.assertEqual(
-            dataset_obj.origin_query,
-            test_query,
-            (
-                "Origin query recorded incorrectly in the Dataset"
-                " object. It does not match the test query."
-            ),
-        )
 
     def test_dataset_from_pandas(self):
         """Set of tests to ensure that the data_handlers.from_pandas
         function is correctly creating bardi Dataset objects"""
 
-        # Create a test Pandas DataFrame
-        d = {"col1": [1, 2, 3, 4], "col2": ["str1", "str2", "str3", "str4"]}
-        df = DataFrame(data=d)
+        df = self.test_df
 
         # ======== Non-Chunked Dataset Tests ========
         dataset_obj = data.from_pandas(df)
-
-        # bardi Dataset object was created and returned
-        self.assertTrue(
-            isinstance(dataset_obj, bardi.Dataset),
-            ("Object created and/or returned" " by the function was incorrect"),
-        )
-        # Data is an Arrow Table
-        self.assertTrue(
-            isinstance(dataset_obj.data, Table),
-            ("The data referenced in the object" " is not an Arrow Table"),
-        )
-        # Recorded data length matches the source
-        self.assertEqual(
-            dataset_obj.origin_row_count,
-            df.shape[0],
-            ("Recorded origin row count" " does not match the Pandas DataFrame"),
-        )
-        # Data length matches the source
-        self.assertEqual(
-            dataset_obj.data.num_rows,
-            df.shape[0],
-            ("Data length in Table does not match" " Pandas DataFrame"),
-        )
-        # Columns are correct
-        self.assertEqual(
-            dataset_obj.data.column_names,
-            list(df.columns),
-            ("Columns of Table do not match" " the columns of the DataFrame"),
-        )
-        # Data types are correct
-        # Format of source recorded correctly
-        self.assertEqual(
-            dataset_obj.origin_format,
-            "pandas",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
-        )
+        self._check_dataset(dataset_obj, df.shape[0], list(df.columns), "pandas")
 
         # ======== Chunked Dataset Tests ========
         chunked_dataset_obj = data.from_pandas(df, min_batches=2)
-
-        # bardi Dataset object was created and returned
-        self.assertTrue(
-            isinstance(chunked_dataset_obj, bardi.Dataset),
-            ("Object created and/or returned by the function" " (with batches) was incorrect"),
-        )
-        # Data is a List of Arrow Tables
-        self.assertTrue(
-            isinstance(chunked_dataset_obj.data, list),
-            ("The data attribute in the object" " is not referencing a list"),
-        )
-        for test_chunk in chunked_dataset_obj.data:
-            self.assertTrue(
-                isinstance(test_chunk, Table),
-                ("The contents of the data list" " are not Arrow Tables"),
-            )
-        # Total length of data matches the source data
-        total_data_length = sum([table.num_rows for table in chunked_dataset_obj.data])
-        self.assertEqual(
-            total_data_length,
-            chunked_dataset_obj.origin_row_count,
-            ("Total length of the data in the list" " does not match recorded length"),
-        )
-        self.assertEqual(
-            total_data_length,
-            df.shape[0],
-            ("Total length of the data in the list" " does not match DataFrame length"),
-        )
-        # Columns are correct
-        for test_chunk in chunked_dataset_obj.data:
-            self.assertEqual(
-                test_chunk.column_names,
-                list(df.columns),
-                ("Columns of Table do not match" " the columns of the DataFrame"),
-            )
-        # Format of source recorded correctly
-        self.assertEqual(
-            dataset_obj.origin_format,
-            "pandas",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
+        self._check_dataset(
+            chunked_dataset_obj, df.shape[0], list(df.columns), "pandas", chunked=True
         )
 
     def test_dataset_from_pyarrow(self):
         """Set of tests to ensure that the data_handlers.from_pyarrow
         function is correctly creating a bardi Dataset object"""
 
-        # Create a test PyArrow Table
-        col1 = array([1, 2, 3, 4])
-        col2 = array(["str1", "str2", "str3", "str4"])
-        names = ["col1", "col2"]
-        test_table = table([col1, col2], names=names)
+        test_table = self.test_table
 
         # ======== Non-Chunked Dataset Tests ========
         dataset_obj = data.from_pyarrow(test_table)
-
-        # bardi Dataset object was created and returned
-        self.assertTrue(
-            isinstance(dataset_obj, bardi.Dataset),
-            ("Object created and/or returned" " by the function was incorrect"),
-        )
-        # Data is an Arrow Table
-        self.assertTrue(
-            isinstance(dataset_obj.data, Table),
-            ("The data referenced in the object" " is not an Arrow Table"),
-        )
-        # Recorded data length matches the source
-        self.assertEqual(
-            dataset_obj.origin_row_count,
-            test_table.num_rows,
-            ("Recorded origin row count does not match" " the Pandas DataFrame"),
-        )
-        # Data length matches the source
-        self.assertEqual(
-            dataset_obj.data.num_rows,
-            test_table.num_rows,
-            ("Data length in Table does not match" " Pandas DataFrame"),
-        )
-        # Columns are correct
-        self.assertEqual(
-            dataset_obj.data.column_names,
-            test_table.column_names,
-            ("Columns of Table do not match the columns" " of the DataFrame"),
-        )
-        # Data types are correct
-        # Format of source recorded correctly
-        self.assertEqual(
-            dataset_obj.origin_format,
-            "pyarrow",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
-        )
+        self._check_dataset(dataset_obj, test_table.num_rows, test_table.column_names, "pyarrow")
 
         # ======== Chunked Dataset Tests ========
         chunked_dataset_obj = data.from_pyarrow(test_table, min_batches=2)
-
-        # bardi Dataset object was created and returned
-        self.assertTrue(
-            isinstance(chunked_dataset_obj, bardi.Dataset),
-            ("Object created and/or returned by the function" " (with batches) was incorrect"),
-        )
-        # Data is a List of Arrow Tables
-        self.assertTrue(
-            isinstance(chunked_dataset_obj.data, list),
-            ("The data attribute in the object" " is not referencing a list"),
-        )
-        for test_chunk in chunked_dataset_obj.data:
-            self.assertTrue(
-                isinstance(test_chunk, Table),
-                ("The contents of the data list" " are not Arrow Tables"),
-            )
-        # Total length of data matches the source data
-        total_data_length = sum([chunk.num_rows for chunk in chunked_dataset_obj.data])
-        self.assertEqual(
-            total_data_length,
-            chunked_dataset_obj.origin_row_count,
-            ("Total length of the data in the list does not" " match recorded length"),
-        )
-        self.assertEqual(
-            total_data_length,
+        self._check_dataset(
+            chunked_dataset_obj,
             test_table.num_rows,
-            ("Total length of the data in the list does not" " match DataFrame length"),
-        )
-        # Columns are correct
-        for test_chunk in chunked_dataset_obj.data:
-            self.assertEqual(
-                test_chunk.column_names,
-                test_table.column_names,
-                ("Columns of Table do not match" " the columns of the DataFrame"),
-            )
-        # Format of source recorded correctly
-        self.assertEqual(
-            dataset_obj.origin_format,
+            test_table.column_names,
             "pyarrow",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
+            chunked=True,
         )
 
     def test_dataset_from_json(self):
@@ -574,42 +231,7 @@ class TestDataHandlers(unittest.TestCase):
         json_obj = dumps(d)
 
         dataset_obj = data.from_json(json_obj)
-
-        # bardi Dataset object was created and returned
-        self.assertTrue(
-            isinstance(dataset_obj, bardi.Dataset),
-            ("Object created and/or returned" " by the function was incorrect"),
-        )
-        # Data is an Arrow Table
-        self.assertTrue(
-            isinstance(dataset_obj.data, Table),
-            ("The data referenced in the object" " is not an Arrow Table"),
-        )
-        # Recorded data length matches the source
-        self.assertEqual(
-            dataset_obj.origin_row_count,
-            1,
-            ("Recorded origin row count does" " not match the Pandas DataFrame"),
-        )
-        # Data length matches the source
-        self.assertEqual(
-            dataset_obj.data.num_rows,
-            1,
-            ("Data length in Table does not match" " Pandas DataFrame"),
-        )
-        # Columns are correct
-        self.assertEqual(
-            dataset_obj.data.column_names,
-            list(d.keys()),
-            ("Columns of Table do not match the columns" " of the DataFrame"),
-        )
-        # Data types are correct
-        # Format of source recorded correctly
-        self.assertEqual(
-            dataset_obj.origin_format,
-            "json",
-            ("Origin format incorrectly recorded" " in the bardi Dataset object"),
-        )
+        self._check_dataset(dataset_obj, 1, list(d.keys()), "json")
 
 
 if __name__ == "__main__":
@@ -117,14 +117,15 @@ class TestPipeline(unittest.TestCase):
             "id_to_token.json",
             "id_to_label.json",
             "embedding_matrix.npy",
-            "CPUNormalizerData.csv",
-            "CPUPreTokenizerData.csv",
-            "CPUEmbeddingGeneratorData.csv",
-            "CPUVocabEncoderData.csv",
-            "CPULabelProcessorData.csv",
-            "CPUSplitterData.csv",
+            "CPUNormalizer#1Data.csv",
+            "CPUPreTokenizer#2Data.csv",
+            "CPUVocabEncoder#4Data.csv",
+            "CPULabelProcessor#5Data.csv",
+            "CPUSplitter#6Data.csv",
         ]
         self.assertTrue(set(expected_files).issubset(set(test_data_contents)))
+        # the embedding generator returns its input table unchanged
+        self.assertNotIn("CPUEmbeddingGenerator#3Data.csv", test_data_contents)
 
     def test_pipeline_run(self):
         self.pipeline = Pipeline(
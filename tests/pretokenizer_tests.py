@@ -5,6 +5,7 @@ import unittest
 from pathlib import Path
 
 import polars as pl
+import pyarrow as pa
 from polars.testing import assert_series_equal, assert_series_not_equal
 
 from bardi.nlp_engineering import CPUPreTokenizer
@@ -87,6 +88,16 @@ class TestPreTokenizer(unittest.TestCase):
             # the new data in the column should not equal the original data (it was split!)
             assert_series_not_equal(split_series, original_series, check_names=False)
 
+        # Retained columns are large_string even when the input is string
+        string_data = pa.table(
+            {col: self.df.get_column(col).to_arrow().cast(pa.string()) for col in self.df.columns}
+        )
+        data, artifacts = self.retain_pretokenizer.run(string_data, None)
+        for col in self.df.columns:
+            self.assertEqual(
+                data.schema.field(f"CPUPreTokenizer_input__{col}").type, pa.large_string()
+            )
+
     def test_write_data(self):
         """A test to ensure that the pre-tokenizer's write function
         correctly produces a file as desired
@@ -381,6 +381,10 @@ class TestRegexExpressions(TestCase):
                 "test": "at 9:52:07am. Rec: 06am 17:34",
                 "expected_output": "at  TIMETOKEN  Rec:  TIMETOKEN   TIMETOKEN ",
             },
+            {
+                "test": "from 14:00 to 23:59",
+                "expected_output": "from  TIMETOKEN  to  TIMETOKEN ",
+            },
         ]
 
         regex_sub_pair = nlp.get_time_regex()
@@ -584,6 +588,19 @@ class TestRegexExpressions(TestCase):
 
         self.assertEqual(output, expected_output, "Incorrect space removal result.")
 
+    def test_no_redundant_pattern_syntax(self):
+        """Tests that the library patterns use plain quantifiers and characters
+        instead of single character classes like [s] and {1,} repetitions."""
+
+        single_char_class = re.compile(r"(?<!\\)\[\\?[^\]^\\]\]")
+        for regex_sub_pair in nlp.PathologyReportRegexSet().get_regex_set():
+            regex_pattern = regex_sub_pair["regex_str"]
+            self.assertIsNone(
+                single_char_class.search(regex_pattern),
+                f"Single character class in {regex_pattern}",
+            )
+            self.assertNotIn("{1,}", regex_pattern, f"{{1,}} repetition in {regex_pattern}")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,15 @@
+import os
+import tempfile
 import unittest
 from unittest import TestCase
 
 import polars as pl
 from polars.testing import assert_series_equal
 
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
 from bardi import nlp_engineering as nlp
 
 HF_SHARED_CACHE = "/mnt/nci/scratch/hf_shared_cache"
@@ -261,6 +267,28 @@ class TestTokenizers(TestCase):
             check_names=False,
         )
 
+    def test_apply_tokenizer_compact_ids(self):
+        tokenizer_encoder = nlp.CPUTokenizerEncoder(
+            fields=self.fields,
+            model_name="Clinical-BigBird",
+            hf_cache_dir=self.hf_cache_dir,
+            concat_fields=True,
+            tokenizer_params={"model_max_length": 6},
+            compact_ids=True,
+        )
+
+        data, _ = tokenizer_encoder.run(data=self.df.to_arrow())
+        df = pl.from_arrow(data)
+
+        expected_text_input_ids = [65, 529, 419, 358, 1198, 66]
+
+        assert_series_equal(
+            df.get_column("input_ids"),
+            pl.Series([expected_text_input_ids], dtype=pl.List(pl.UInt16())),
+            check_names=False,
+        )
+        self.assertEqual(df.schema["attention_mask"], pl.List(pl.UInt8()))
+
     def test_default_setting_model_max_length(self):
         tokenizer_encoder = nlp.CPUTokenizerEncoder(
             fields=self.fields,
@@ -273,6 +301,34 @@ class TestTokenizers(TestCase):
 
         self.assertEqual(tokenizer_encoder.tokenizer_model.model_max_length, 4096)
 
+    def test_reload_rewritten_tokenizer_file(self):
+        """A tokenizer rewritten at the same path between runs is reloaded"""
+
+        def write_tokenizer(path, vocab):
+            tokenizer = Tokenizer(WordLevel(vocab=vocab, unk_token="[UNK]"))
+            tokenizer.pre_tokenizer = Whitespace()
+            tokenizer.save(path)
+
+        data = pl.DataFrame({"text": ["car blue"]}).to_arrow()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tokenizer_path = os.path.join(tmp_dir, "tokenizer.json")
+            write_tokenizer(tokenizer_path, {"[UNK]": 0, "[PAD]": 1, "car": 2, "blue": 3})
+
+            tokenizer_encoder = nlp.CPUTokenizerEncoder(
+                fields="text", model_name=tokenizer_path, cores=1
+            )
+            data_1, _ = tokenizer_encoder.run(data=data)
+
+            write_tokenizer(tokenizer_path, {"[UNK]": 0, "[PAD]": 1, "car": 7, "blue": 5})
+            # Make sure the rewrite is seen as a newer file on coarse clocks
+            modified = os.stat(tokenizer_path).st_mtime_ns + 1_000_000_000
+            os.utime(tokenizer_path, ns=(modified, modified))
+            data_2, _ = tokenizer_encoder.run(data=data)
+
+        self.assertEqual(data_1.column("input_ids").to_pylist(), [[2, 3]])
+        self.assertEqual(data_2.column("input_ids").to_pylist(), [[7, 5]])
+
 
 if __name__ == "__main__":
     unittest.main()
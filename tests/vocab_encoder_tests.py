@@ -108,6 +108,28 @@ class TestVocabEncoder(unittest.TestCase):
         correct_ans = pa.table(correct_ans, schema=schema)
         self.assertEqual(data, correct_ans, "Incorrect")
 
+    def test_id_dtype(self):
+        """A test to ensure that ids are encoded with the requested integer type"""
+        new_field_name = "text"
+        self.vocabencoder = CPUVocabEncoder(
+            fields=["b", "c"], field_rename=new_field_name, concat_fields=True, id_dtype=pa.int16()
+        )
+        data, _ = self.vocabencoder.run(
+            data=self.df.to_arrow(), artifacts={"a": []}, id_to_token=self.id_to_token
+        )
+
+        correct_ans = {new_field_name: [[0, 4, 1], [2, 3, 2, 2, 3], [6, 4, 3]]}
+        schema = pa.schema([pa.field(new_field_name, pa.large_list(pa.int16()))])
+        correct_ans = pa.table(correct_ans, schema=schema)
+        self.assertEqual(data.select([new_field_name]), correct_ans, "Incorrect")
+
+        # A vocab with ids out of range of the requested type is rejected
+        self.vocabencoder = CPUVocabEncoder(fields=["b"], id_dtype=pa.int8())
+        with self.assertRaises(pa.ArrowInvalid):
+            self.vocabencoder.run(
+                data=self.df.to_arrow(), id_to_token={**self.id_to_token, 1000: "zz"}
+            )
+
     def test_column_retention(self):
 
         fields = ["b", "c", "d", "e"]